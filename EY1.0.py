@@ -1,16 +1,19 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
-import openai
-from io import BytesIO
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet
-from sklearn.linear_model import LinearRegression
+
+from green_finance import cashflow
+from green_finance import charts
+from green_finance import export
+from green_finance import prediction
+from green_finance import reference
+from green_finance import reports
+from green_finance import scenario_cache
+from green_finance import timing
+from green_finance.advisor import get_advisor
+from green_finance.intents import match_intent
 
 st.set_page_config(page_title="AI-Driven Green Investment Platform", layout="wide")
+timer=timing.start_rerun("ey1")
 menu = st.tabs(["🏠 Home", "💹 ROI Calculator", "🤖 AI Green Advisor"])
 
 # ---------------- HOME ----------------
@@ -29,42 +32,26 @@ with menu[0]:
     - [Maybank ESG Financing](https://www.maybank2u.com.my/maybank2u/malaysia/en/business/sme/grow/esg-financing-listing.page)
     """)
     st.success("Empowering SMEs with AI insights for sustainable growth.")
+timer.lap("home")
 
 # ---------------- ROI CALCULATOR ----------------
 with menu[1]:
     st.title("💹 ROI Calculator for Green Investment")
 
-    solar_data = {"Johor":1663.31,"Kedah":1797.00,"Kelantan":1726.84,"Kuala Lumpur":1663.42,"Melaka":1722.05,
-                  "Negeri Sembilan":1676.98,"Pahang":1704.77,"Perak":1747.96,"Perlis":1810.04,"Pulau Pinang":1820.17,
-                  "Putrajaya":1719.69,"Sabah":1756.45,"Sarawak":1696.05,"Selangor":1724.90,"Terengganu":1689.71}
-    water_data = {"Kuala Lumpur":15.4,"Selangor":15.4,"Perak":12.6,"Pahang":10.2,"Negeri Sembilan":13,"Johor":21,
-                  "Kelantan":11.4,"Terengganu":10,"Kedah":18,"Perlis":11.3,"Pulau Pinang":5,"Melaka":14.4,"Sarawak":12.6,"Sabah":11.8}
-    tariffs_tiers=[(1,200,0.218),(201,300,0.334),(301,600,0.516),(601,900,0.546),(901,float('inf'),0.571)]
+    data=reference.current()
+    solar_data,water_data=data.solar_data,data.water_data
 
     state = st.selectbox("🏙️ Select State", list(solar_data.keys()))
     category = st.selectbox("Investment Category", ["Solar","Water","Other"])
-    if category == "Other": st.warning("⚠️ 'Other' category not supported yet."); st.stop()
+    if category == "Other": st.warning("⚠️ 'Other' category not supported yet."); timing.show_debug_panel(timer.finish()); st.stop()
     investment = st.number_input("💰 Initial Investment (RM)", min_value=1000, value=5000, step=1000)
 
-    def calculate_bill_from_kwh(kwh):
-        bill, remaining = 0.0, kwh
-        for low, high, rate in tariffs_tiers:
-            limit = high - low + 1 if high != float('inf') else float('inf')
-            use = min(remaining, limit)
-            bill += use * rate
-            remaining -= use
-            if remaining <= 0: break
-        return round(bill,2)
-
-    def calculate_kwh_from_bill(target_bill):
-        for kwh in range(1,5000):
-            if calculate_bill_from_kwh(kwh) >= target_bill: return kwh
-        return 5000
-
-    house_types={"Terrace":(4,6),"Semi-detached":(6,9),"Bungalow":(9,13)}
+    calculate_bill_from_kwh=data.tariff_engine.bill_from_kwh
+    calculate_kwh_from_bill=data.tariff_engine.kwh_from_bill
+
     if category=="Solar":
-        house_type=st.selectbox("🏠 House Type", list(house_types.keys()))
-        system_min,system_max=house_types[house_type]
+        house_type=st.selectbox("🏠 House Type", list(data.house_types.keys()))
+        system_min,system_max=data.house_types[house_type]["system_range"]
 
     bill_label="💡 Monthly Bill (RM)" if category=="Solar" else "💧 Monthly Bill (RM)"
     input_type=st.radio("Choose Input Type", [bill_label,"Monthly Consumption"])
@@ -84,114 +71,152 @@ with menu[1]:
             monthly_savings_default=int(estimated_system*60)
         else:
             monthly_kwh=st.number_input("Enter monthly consumption (m³)",min_value=1,value=20)
-            monthly_bill=monthly_kwh*0.5
+            monthly_bill=monthly_kwh*data.default_water_tariff
             monthly_savings_default=int(monthly_bill*0.2)
+    timer.lap("tariff_sizing")
+
+    # Results, prediction, chart and export only depend on these inputs; their widgets rerun just this fragment
+    @st.fragment
+    def roi_results(state,category,house_type,monthly_bill,investment,monthly_savings_default,compare_kwh,compare_water):
+        results_timer=timing.start_rerun("ey1.results")
+        monthly_savings=st.number_input("⚡ Monthly Savings (RM)",min_value=1,value=monthly_savings_default,step=100)
+        years=st.slider("⏳ Years",1,10,5)
+
+        summary=scenario_cache.roi_summary(investment,monthly_savings,years)
+        total_savings,roi=summary["total_savings"],summary["roi"]
+        payback_years=summary["payback_years"]
+
+        st.subheader("📊 Results")
+        st.write(f"**ROI:** {roi:.2f}%")
+        st.write(f"**Total Savings ({years} yrs): RM {total_savings:,.2f}**")
+        st.write(f"**Payback:** {payback_years:.1f} years")
+        with st.expander("💹 NPV / IRR"):
+            discount_rate=st.slider("Discount rate (%/yr)",0.0,15.0,100*cashflow.DEFAULT_DISCOUNT_RATE,0.5)/100
+            escalation=st.slider("Tariff escalation (%/yr)",0.0,10.0,100*cashflow.DEFAULT_ESCALATION,0.5)/100
+            degradation=cashflow.SOLAR_DEGRADATION if category=="Solar" else cashflow.DEFAULT_DEGRADATION
+            dcf=scenario_cache.discounted_cash_flow(investment,monthly_savings,years,discount_rate,escalation,degradation)
+            npv,irr,discounted_payback=dcf["npv"],dcf["irr"],dcf["discounted_payback_months"]
+            st.write(f"**NPV:** RM {npv:,.2f}")
+            st.write(f"**IRR:** {'N/A' if np.isnan(irr) else f'{irr:.2%}'}")
+            st.write(f"**Discounted Payback:** {'N/A' if np.isinf(discounted_payback) else f'{discounted_payback:.0f} months'}")
+        results_timer.lap("roi")
+
+        # ---------- AI Level 1: ROI Prediction ----------
+        predicted_roi=scenario_cache.predicted_roi(state,category,house_type,monthly_bill,investment,years)
+        st.info(f"🤖 Model-estimated ROI: {predicted_roi:.2f}%")
+        st.caption(f"A machine-learned surrogate of this calculator, trained on scenarios simulated with its own engine: it approximates the ROI above (average error ±{prediction.holdout_mae():.0f} pp) and is not a forecast from real outcomes.")
+        results_timer.lap("prediction")
+
+        # ---------- AI Level 2: Recommendation ----------
+        def ai_recommendation(state,category,investment):
+            if category=="Solar":
+                if solar_data[state]>1750 and investment<20000:
+                    return "🌞 High ROI potential — consider 6–8 kWp system."
+                elif solar_data[state]<1700:
+                    return "⚠️ Low irradiation — ROI may be slower. Combine with water projects."
+                else:
+                    return "✅ Balanced investment for your state."
+            elif category=="Water":
+                return "💧 High tariff area — good efficiency ROI." if water_data[state]>15 else "💧 Moderate ROI — pair with solar."
+        st.success(f"🧠 AI Suggestion: {ai_recommendation(state,category,investment)}")
+        results_timer.lap("recommendation")
+
+        # ---------- Chart ----------
+        months,savings=summary["months"],summary["savings"]
+        st.image(charts.cumulative_savings_png(state,category,investment,monthly_savings,years))
+        results_timer.lap("charts")
+
+        # ---------- All States ----------
+        if st.checkbox("🗺️ Compare all states"):
+            col1,col2,col3=st.columns(3)
+            compare_kwh=col1.number_input("Electricity (kWh/month)",min_value=1,value=int(compare_kwh))
+            compare_water=col2.number_input("Water (m³/month)",min_value=1,value=int(compare_water))
+            house_options=list(data.house_types.keys())
+            compare_house=col3.selectbox("House type (solar)",house_options,index=house_options.index(house_type) if house_type in house_options else 0)
+            table=scenario_cache.state_comparison(investment,years,compare_kwh,compare_water,compare_house)
+            st.dataframe({"Rank":table["rank"],"State":table["state"],"Category":table["category"],"Monthly Savings (RM)":np.round(table["monthly_savings"],2),"ROI (%)":np.round(table["roi"],2),"Payback (months)":np.where(np.isfinite(table["payback_months"]),np.round(table["payback_months"],1),np.nan)},hide_index=True)
+            st.image(charts.state_comparison_png(investment,years,compare_kwh,compare_water,compare_house))
+        results_timer.lap("state_comparison")
+
+        # ---------- Export ----------
+        export_format=st.selectbox("Export Format",[*export.FORMATS,"PDF"])
+        report_scenario={"state":state,"category":category,"investment":investment,"monthly_savings":monthly_savings,"years":years}
+        if st.session_state.get("pdf_scenario")!=report_scenario: st.session_state.pop("pdf_job",None)
+        st.session_state["pdf_scenario"]=report_scenario
+        if st.button("Export Report"):
+            if export_format in export.FORMATS:
+                report_data=export.to_bytes(export.monthly_columns(months,savings),export_format)
+                st.download_button(f"Download {export_format}",report_data,file_name=export.filename("roi",export_format),mime=export.mime_type(export_format))
+            else:
+                st.session_state["pdf_job"]=reports.submit_pdf(report_scenario)
+        pdf_job=st.session_state.get("pdf_job")
+        if export_format=="PDF" and pdf_job is not None:
+            if pdf_job.done():
+                st.download_button("Download PDF",data=pdf_job.result(),file_name="roi_report.pdf",mime="application/pdf")
+            else:
+                # Poll instead of blocking the rerun; a full rerun once it is ready also stops the polling
+                @st.fragment(run_every=reports.POLL_SECONDS)
+                def pdf_progress():
+                    job=st.session_state.get("pdf_job")
+                    if job is None or job.done(): st.rerun()
+                    st.info("⏳ Building PDF report...")
+                pdf_progress()
+        results_timer.lap("export")
+        timing.show_debug_panel(results_timer.finish(),st)
+
+    timer.lap("inputs")
+    compare_kwh=monthly_kwh if category=="Solar" else 400
+    compare_water=(monthly_kwh if monthly_kwh is not None else monthly_bill/data.default_water_tariff) if category=="Water" else 20
+    roi_results(state,category,house_type if category=="Solar" else "",monthly_bill,investment,monthly_savings_default,compare_kwh,compare_water)
+    timer.lap("results")
 
-    monthly_savings=st.number_input("⚡ Monthly Savings (RM)",min_value=1,value=monthly_savings_default,step=100)
-    years=st.slider("⏳ Years",1,10,5)
+# ---------------- AI GREEN ADVISOR ----------------
+with menu[2]:
 
-    total_savings=monthly_savings*12*years
-    roi=((total_savings-investment)/investment)*100
-    payback_months=investment/monthly_savings if monthly_savings>0 else float('inf')
-    payback_years=payback_months/12 if payback_months!=float('inf') else float('inf')
+    # Asking a question reruns only the advisor, not the ROI calculator
+    @st.fragment
+    def advisor_panel():
+        advisor_timer = timing.start_rerun("ey1.advisor")
+        st.title("🤖 AI Green Financing Advisor")
+        st.write("Ask about ROI, ESG, or financing opportunities.")
 
-    st.subheader("📊 Results")
-    st.write(f"**ROI:** {roi:.2f}%")
-    st.write(f"**Total Savings ({years} yrs): RM {total_savings:,.2f}**")
-    st.write(f"**Payback:** {payback_years:.1f} years")
+        # User input
+        user_question = st.text_input("💬 Your question:")
 
-    # ---------- AI Level 1: ROI Prediction ----------
-    X=np.array([[1000],[5000],[10000],[20000],[30000],[50000]])
-    y=np.array([8,25,45,60,75,85])
-    model=LinearRegression().fit(X,y)
-    predicted_roi=model.predict(np.array([[investment]]))[0]
-    st.info(f"🤖 AI Predicted ROI: {predicted_roi:.2f}%")
+        if st.button("Ask AI"):
+            ql = user_question.lower().strip()
 
-    # ---------- AI Level 2: Recommendation ----------
-    def ai_recommendation(state,category,investment):
-        if category=="Solar":
-            if solar_data[state]>1750 and investment<20000:
-                return "🌞 High ROI potential — consider 6–8 kWp system."
-            elif solar_data[state]<1700:
-                return "⚠️ Low irradiation — ROI may be slower. Combine with water projects."
-            else:
-                return "✅ Balanced investment for your state."
-        elif category=="Water":
-            return "💧 High tariff area — good efficiency ROI." if water_data[state]>15 else "💧 Moderate ROI — pair with solar."
-    st.success(f"🧠 AI Suggestion: {ai_recommendation(state,category,investment)}")
-
-    # ---------- Chart ----------
-    months=np.arange(1,years*12+1)
-    savings=np.cumsum(np.full(years*12,monthly_savings)+np.random.normal(0,monthly_savings*0.05,years*12))
-    fig,ax=plt.subplots(figsize=(6,4))
-    ax.plot(months,savings,label="Cumulative Savings")
-    ax.axhline(y=investment,linestyle="--",label="Investment")
-    ax.legend(); ax.set_xlabel("Months"); ax.set_ylabel("RM")
-    st.pyplot(fig)
-
-    # ---------- Export ----------
-    export=st.selectbox("Export Format",["CSV","PDF"])
-    if st.button("Export Report"):
-        df=pd.DataFrame({"Month":months,"Cumulative Savings":savings})
-        if export=="CSV":
-            st.download_button("Download CSV",df.to_csv(index=False).encode("utf-8"),file_name="roi.csv",mime="text/csv")
-        else:
-            buffer=BytesIO()
-            doc=SimpleDocTemplate(buffer,pagesize=A4)
-            styles=getSampleStyleSheet()
-            data=[["Month","Cumulative Savings"]]+[[m,f"RM {s:,.2f}"] for m,s in zip(months,savings[:120])]
-            table=Table(data,colWidths=[100,200])
-            table.setStyle(TableStyle([('BACKGROUND',(0,0),(-1,0),colors.green),
-                                       ('TEXTCOLOR',(0,0),(-1,0),colors.whitesmoke),
-                                       ('ALIGN',(0,0),(-1,-1),'CENTER'),
-                                       ('GRID',(0,0),(-1,-1),1,colors.black)]))
-            elements=[Paragraph("ROI Report",styles["Title"]),Spacer(1,12),table]
-            doc.build(elements)
-            pdf=buffer.getvalue()
-            st.download_button("Download PDF",data=pdf,file_name="roi_report.pdf",mime="application/pdf")
+            with advisor_timer.span("advisor.rules"):
+                intent = match_intent(ql)
 
-# ---------------- AI GREEN ADVISOR ----------------
-with menu[2]:
+            if ql == "":
+                st.write("Please enter a question.")
 
-    st.title("🤖 AI Green Financing Advisor")
-    st.write("Ask about ROI, ESG, or financing opportunities.")
-
-    # User input
-    user_question = st.text_input("💬 Your question:")
-    
-    if st.button("Ask AI"):
-        ql = user_question.lower().strip()
-        
-        if ql == "":
-            st.write("Please enter a question.")
-        
-        # Rule-based quick answers
-        elif "loan" in ql or "finance" in ql:
-            st.write("💬 AI Advisor: GTFS and LCTF offer low-interest green financing for SMEs.")
-        elif "roi" in ql or "payback" in ql:
-            st.write("💬 AI Advisor: Solar ROI typically ranges from 30–80% depending on state irradiation.")
-        elif "esg" in ql:
-            st.write("💬 AI Advisor: ESG adoption improves access to capital and brand reputation.")
-        
-        # Fallback to OpenAI GPT
-        else:
-            try:
-                # Check if API key exists
-                api_key = st.secrets.get("OPENAI_API_KEY", None)
-                if not api_key:
-                    st.error("OpenAI API key is missing! Please add it in Streamlit Secrets.")
-                else:
-                    openai.api_key = api_key
-                    response = openai.chat.completions.create(
-                        model="gpt-3.5-turbo",  # works with all API keys
-                        messages=[
-                            {"role": "system", "content": "You are a helpful assistant."},
-                            {"role": "user", "content": user_question}
-                        ],
-                        temperature=0.7,
-                        max_tokens=300
-                    )
-                    answer = response.choices[0].message.content
-                    st.write(f"💬 AI Advisor (GPT): {answer}")
-            except Exception as e:
-                st.error(f"Error contacting AI: {e}")
+            # Rule-based quick answers
+            elif intent is not None:
+                st.write(f"💬 AI Advisor: {intent['answer']}")
+
+            # Fallback to OpenAI GPT
+            else:
+                try:
+                    # Check if API key exists
+                    api_key = st.secrets.get("OPENAI_API_KEY", None)
+                    if not api_key:
+                        st.error("OpenAI API key is missing! Please add it in Streamlit Secrets.")
+                    else:
+                        # Cached and shared across sessions; identical questions share one request
+                        advisor = get_advisor(st.secrets.get("OPENAI_BASE_URL", None), st.secrets.get("ADVISOR_CACHE_PATH", None))
+                        placeholder = st.empty()
+                        answer = ""
+                        with advisor_timer.span("advisor.openai"):
+                            for chunk in advisor.ask(user_question, api_key):
+                                answer += chunk
+                                placeholder.write(f"💬 AI Advisor (GPT): {answer}")
+                except Exception as e:
+                    st.error(f"Error contacting AI: {e}")
+        timing.show_debug_panel(advisor_timer.finish(), st)
+
+    advisor_panel()
+timer.lap("advisor")
+
+timing.show_debug_panel(timer.finish())
@@ -1,15 +1,25 @@
+import calendar
+import tempfile
+
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
-from io import BytesIO
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-from reportlab.lib.styles import getSampleStyleSheet
+
+from green_finance import bulk
+from green_finance import cashflow
+from green_finance import charts
+from green_finance import export
+from green_finance import montecarlo
+from green_finance import optimizer
+from green_finance import reference
+from green_finance import reports
+from green_finance import roi as roi_engine
+from green_finance import scenario_cache
+from green_finance import sensitivity
+from green_finance import timing
 
 # App configuration
 st.set_page_config(page_title="Green Financing Awareness", layout="wide")
+timer = timing.start_rerun("app7")
 
 # Top navigation menu
 menu = st.tabs(["🏠 Home", "💹 ROI Calculator"])
@@ -38,24 +48,154 @@ with menu[0]:
     """)
 
     st.success("This hub provides SMEs with awareness, resources, and financial guidance for a sustainable future.")
+timer.lap("home")
 
 # ROI CALCULATOR PAGE
 with menu[1]:
     st.title("💹 ROI Calculator for Green Investment")
 
-    # Solar yearly potential (kWh) by state
-    solar_data = {
-        "Johor": 1663.31, "Kedah": 1797.00, "Kelantan": 1726.84, "Kuala Lumpur": 1663.42, 
-        "Melaka": 1722.05, "Negeri Sembilan": 1676.98, "Pahang": 1704.77,
-        "Perak": 1747.96, "Perlis": 1810.04, "Pulau Pinang": 1820.17, "Putrajaya": 1719.69,
-        "Sabah": 1756.45, "Sarawak": 1696.05, "Selangor": 1724.90, "Terengganu": 1689.71
-    }
+    mode = st.radio("Mode", ["Single scenario", "Bulk CSV upload", "Budget optimizer"], horizontal=True)
+
+    # Bulk mode: score a whole customer list chunk by chunk, then stop
+    if mode == "Bulk CSV upload":
+        st.caption(
+            "Columns: state, category, investment, years, monthly_bill and/or monthly_consumption; "
+            "optional house_type (blank is Terrace House), efficiency (%) and monthly_savings."
+        )
+        uploaded = st.file_uploader("📄 Customer list (CSV)", type="csv")
+        if uploaded is not None:
+            if st.session_state.get("bulk_upload_id") != uploaded.file_id:
+                st.session_state.pop("bulk_result", None)
+                progress = st.progress(0.0, text="Scoring customers...")
+                scored = tempfile.TemporaryFile("w+", newline="", encoding="utf-8")
+
+                def show_progress(rows):
+                    progress.progress(min(uploaded.tell() / max(uploaded.size, 1), 1.0), text=f"Scored {rows:,} rows")
+                try:
+                    with timer.span("bulk.score"):
+                        rows = bulk.score_csv(uploaded, scored, progress=show_progress)
+                except ValueError as e:
+                    scored.close()
+                    st.error(f"Could not score this file: {e}")
+                else:
+                    st.session_state["bulk_result"] = (scored, rows)
+                st.session_state["bulk_upload_id"] = uploaded.file_id
+            if "bulk_result" in st.session_state:
+                scored, rows = st.session_state["bulk_result"]
+                st.success(f"Scored {rows:,} customers.")
+                scored.seek(0)
+                st.download_button(
+                    "Download Scored CSV",
+                    data=scored,
+                    file_name=f"roi_scored_{uploaded.name}",
+                    mime="text/csv"
+                )
+        timing.show_debug_panel(timer.finish())
+        st.stop()
+
+    # Optimizer mode: best set of candidate projects within one budget, then stop
+    if mode == "Budget optimizer":
+        st.caption("Same columns as the bulk upload; each row is one candidate project (a site and category).")
+        uploaded = st.file_uploader("📄 Candidate projects (CSV)", type="csv")
+        budget = st.number_input("💰 Total Budget (RM)", min_value=1000, value=50000, step=1000)
+        objective = st.radio("Maximize", ["Total savings", "NPV"], horizontal=True)
+        discount_rate = cashflow.DEFAULT_DISCOUNT_RATE
+        if objective == "NPV":
+            discount_rate = st.slider("Discount rate (% per year)", 0.0, 15.0, 100 * discount_rate, 0.5) / 100
+        # The result is kept across reruns so its report archive can be built and polled for
+        optimizer_inputs = (uploaded.file_id if uploaded is not None else None, budget, objective, discount_rate)
+        if st.session_state.get("optimizer_inputs") != optimizer_inputs:
+            st.session_state.pop("optimizer_result", None)
+            st.session_state.pop("zip_job", None)
+        st.session_state["optimizer_inputs"] = optimizer_inputs
+        if uploaded is not None and st.button("Optimize Portfolio"):
+            st.session_state.pop("zip_job", None)
+            try:
+                candidates = bulk.read_columns(uploaded)
+            except ValueError as e:
+                st.session_state.pop("optimizer_result", None)
+                st.error(f"Could not read this file: {e}")
+            else:
+                with st.spinner("Searching for the best portfolio..."), timer.span("optimizer.solve"):
+                    result = optimizer.optimize(
+                        candidates, budget, optimizer.NPV if objective == "NPV" else optimizer.SAVINGS, discount_rate
+                    )
+                st.session_state["optimizer_result"] = (candidates, result)
+        if "optimizer_result" in st.session_state:
+            candidates, result = st.session_state["optimizer_result"]
+            selected = result["selected"]
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Projects Selected", f"{selected.sum()} of {len(selected)}")
+            col2.metric("Invested", f"RM {result['total_investment']:,.0f}")
+            col3.metric(objective, f"RM {result['objective_value']:,.0f}")
+            st.dataframe({
+                "Row": np.flatnonzero(selected) + 1,
+                "State": candidates["state"][selected],
+                "Category": candidates["category"][selected],
+                "Investment (RM)": candidates["investment"][selected],
+                "Monthly Savings (RM)": result["scores"]["monthly_savings"][selected],
+                "ROI (%)": np.round(result["scores"]["roi"][selected], 2),
+            })
+            stats = result["stats"]
+            st.caption(
+                f"{stats['usable']:,} of {stats['candidates']:,} candidates considered, {stats['nodes']:,} search nodes "
+                f"on {stats['workers']} worker(s) in {stats['total_ms']:.0f} ms "
+                f"(scoring {stats['evaluate_ms']:.0f} ms, search {stats['solve_ms']:.0f} ms)"
+                + ("" if stats["optimal"] else "; node limit reached, best portfolio found so far")
+            )
+
+            # Savings series of the selected projects, one long table per granularity
+            portfolio = [
+                {
+                    "state": str(candidates["state"][row]),
+                    "category": str(candidates["category"][row]),
+                    "investment": float(candidates["investment"][row]),
+                    "monthly_savings": float(result["scores"]["monthly_savings"][row]),
+                    "years": int(candidates["years"][row]),
+                }
+                for row in np.flatnonzero(selected)
+            ]
+            portfolio_format = st.selectbox("Portfolio export format", list(export.FORMATS))
+            if portfolio and st.button("Export Portfolio Savings"):
+                monthly_table, yearly_table = export.scenario_columns(portfolio)
+                for label, columns in [("Monthly", monthly_table), ("Yearly", yearly_table)]:
+                    st.download_button(
+                        f"Download {label} {portfolio_format}",
+                        data=export.to_bytes(columns, portfolio_format),
+                        file_name=export.filename(f"roi_portfolio_{label.lower()}", portfolio_format),
+                        mime=export.mime_type(portfolio_format)
+                    )
+
+            # One PDF report per selected project, rendered on the report pool into a single ZIP
+            if portfolio and st.button("Build Reports ZIP"):
+                st.session_state["zip_job"] = reports.submit_reports_zip(portfolio)
+            zip_job = st.session_state.get("zip_job")
+            if zip_job is not None:
+                if zip_job.done():
+                    st.download_button(
+                        "Download Reports ZIP",
+                        data=zip_job.result(),
+                        file_name="roi_reports_portfolio.zip",
+                        mime="application/zip"
+                    )
+                else:
+                    @st.fragment(run_every=reports.POLL_SECONDS)
+                    def zip_progress():
+                        job = st.session_state.get("zip_job")
+                        if job is None or job.done():
+                            st.rerun()
+                        st.info(f"⏳ Building {len(portfolio)} PDF reports... the download button appears here when they are ready.")
+
+                    zip_progress()
+        timing.show_debug_panel(timer.finish())
+        st.stop()
 
-    water_data = {
-        "Kuala Lumpur": 15.4, "Selangor": 15.4, "Perak": 12.6, "Pahang": 10.2, "Negeri Sembilan": 13,
-        "Johor": 21, "Kelantan": 11.4, "Terengganu": 10, "Kedah": 18, "Perlis": 11.3,
-        "Pulau Pinang": 5, "Melaka": 14.4, "Sarawak": 12.6, "Sabah": 11.8
-    }
+    # One snapshot per rerun, so a reload mid-run cannot mix tariff versions
+    data = reference.current()
+    solar_data = data.solar_data
+    house_types = data.house_types
+    calculate_bill_from_kwh = data.tariff_engine.bill_from_kwh
+    calculate_kwh_from_bill = data.tariff_engine.kwh_from_bill
 
     state_list = list(solar_data.keys())
     state = st.selectbox("🏙️ Select Your State", state_list)
@@ -67,69 +207,12 @@ with menu[1]:
     # ✅ Stop execution if "Other" is selected
     if category == "Other":
         st.warning("⚠️ No results available for 'Other' category.")
+        timing.show_debug_panel(timer.finish())
         st.stop()
 
     # User inputs
     investment = st.number_input("💰 Initial Investment (RM)", min_value=1000, value=5000, step=1000)
 
-    # Tiered TNB residential tariff
-    tariffs_tiers = [
-        (1, 200, 0.218),
-        (201, 300, 0.334),
-        (301, 600, 0.516),
-        (601, 900, 0.546),
-        (901, float('inf'), 0.571)
-    ]
-
-    def calculate_solar_savings(monthly_consumption_kwh, solar_offset_kwh):
-        remaining_offset = solar_offset_kwh
-        savings = 0.0
-        for low, high, rate in tariffs_tiers:
-            if remaining_offset <= 0:
-                break
-            tier_available = max(0, min(high, monthly_consumption_kwh) - low + 1)
-            if tier_available <= 0:
-                continue
-            use = min(tier_available, remaining_offset)
-            savings += use * rate
-            remaining_offset -= use
-        return round(savings, 2)
-
-    def calculate_bill_from_kwh(kwh):
-        bill = 0.0
-        remaining = kwh
-        for low, high, rate in tariffs_tiers:
-            limit = high - low + 1 if high != float('inf') else float('inf')
-            use = min(remaining, limit)
-            if use <= 0:
-                continue
-            bill += use * rate
-            remaining -= use
-            if remaining <= 0:
-                break
-        return round(bill, 2)
-
-    def calculate_kwh_from_bill(target_bill, max_kwh=5000):
-        for kwh in range(1, max_kwh + 1):
-            if calculate_bill_from_kwh(kwh) >= target_bill:
-                return kwh
-        return max_kwh
-
-    house_types = {
-        "Terrace House": {"system_range": (4, 6), "cost_range": (16000, 24000)},
-        "Semi-detached": {"system_range": (6, 9), "cost_range": (24000, 34000)},
-        "Bungalow": {"system_range": (9, 13), "cost_range": (34000, 46000)}
-    }
-
-    solar_bill_map = [
-        {"min": 170, "max": 230, "size": 4.5, "kwh": 473, "saving": (168, 203)},
-        {"min": 240, "max": 310, "size": 5.5, "kwh": 578, "saving": (239, 281)},
-        {"min": 320, "max": 440, "size": 7.0, "kwh": 735, "saving": (319, 389)},
-        {"min": 450, "max": 570, "size": 9.5, "kwh": 998, "saving": (448, 520)},
-        {"min": 580, "max": 700, "size": 11.5, "kwh": 1208, "saving": (577, 648)},
-        {"min": 701, "max": 99999, "size": 13.0, "kwh": 1365, "saving": (685, 704)},
-    ]
-
     # Dynamic input labels
     if category == "Water":
         bill_label = "💧 Monthly water bill (RM)"
@@ -141,51 +224,33 @@ with menu[1]:
     input_type = st.radio("Choose input type", [bill_label, consumption_label])
 
     house_type = None
-    system_min = system_max = None
     if category == "Solar":
         house_type = st.selectbox("🏠 House Type", list(house_types.keys()))
-        system_min, system_max = house_types[house_type]["system_range"]
 
     if input_type == bill_label:
         monthly_bill = st.number_input("Enter your monthly bill (RM)", min_value=10, max_value=20000, value=300)
 
         if category == "Solar":
             monthly_kwh = calculate_kwh_from_bill(monthly_bill)
-            matched = None
-            for row in solar_bill_map:
-                if row["min"] <= monthly_bill <= row["max"]:
-                    matched = row
-                    break
+            system_size_kw, monthly_savings_default, matched = roi_engine.size_solar_from_bill(monthly_bill, house_type)
             if matched:
-                system_size_kw = float(matched["size"])
-                if system_min is not None:
-                    system_size_kw = max(system_min, min(system_size_kw, system_max))
-                monthly_savings_default = int(np.mean(matched["saving"]))
                 st.write(f"🔧 Recommended System Size: {system_size_kw:.1f} kWp ({house_type})")
             else:
-                system_size_kw = (system_min + system_max) / 2
-                monthly_savings_default = int(system_size_kw * 60)
                 st.write(f"🔧 Fallback System Size: {system_size_kw:.1f} kWp ({house_type})")
         else:
             monthly_kwh = None
-            monthly_savings_default = int(monthly_bill * 0.2)
+            monthly_savings_default = roi_engine.water_savings(monthly_bill)
 
     else:
         if category == "Solar":
             monthly_kwh = st.number_input("Enter your average monthly consumption (kWh)", min_value=1, max_value=50000, value=400)
             monthly_bill = calculate_bill_from_kwh(monthly_kwh)
-            estimated_system_kw = max(system_min, min((monthly_kwh / 100.0), system_max))
-            monthly_savings_default = int(estimated_system_kw * 60)
+            estimated_system_kw, monthly_savings_default = roi_engine.size_solar_from_kwh(monthly_kwh, house_type)
             st.write(f"🔧 Estimated System Size: {estimated_system_kw:.1f} kWp ({house_type})")
-        elif category == "Water":
-            monthly_kwh = st.number_input("Enter your average monthly consumption (m³)", min_value=1, max_value=10000, value=20)
-            tariff = 0.5
-            monthly_bill = monthly_kwh * tariff
-            monthly_savings_default = int(monthly_bill * 0.2)
         else:
-            monthly_kwh = None
-            monthly_bill = 0
-            monthly_savings_default = 1000
+            monthly_kwh = st.number_input("Enter your average monthly consumption (m³)", min_value=1, max_value=10000, value=20)
+            monthly_bill = monthly_kwh * data.default_water_tariff
+            monthly_savings_default = roi_engine.water_savings(monthly_bill)
 
     # Dynamic output labels
     if category == "Water":
@@ -194,192 +259,215 @@ with menu[1]:
     else:
         st.write(f"🏠 Average Monthly Consumption: {monthly_kwh} kWh")
         st.write(f"💡 Average Monthly Bill: RM {monthly_bill}")
+    timer.lap("tariff_sizing")
+
+    # Hourly net-metering estimate from the state's yearly yield
+    if category == "Solar" and st.checkbox("☀️ Estimate savings with an hourly net-metering simulation"):
+        system_kw = system_size_kw if input_type == bill_label else estimated_system_kw
+        hourly = scenario_cache.solar_hourly(state, system_kw, monthly_kwh)
+        monthly_savings_default = hourly["monthly_savings"]
+        st.write(
+            f"☀️ Simulated Average Monthly Savings: RM {monthly_savings_default:,.2f} "
+            f"({hourly['self_consumption']:.0%} of generation used on site)"
+        )
+        st.dataframe({
+            "Month": calendar.month_abbr[1:],
+            "Generation (kWh)": hourly["generation_kwh"].round(1),
+            "Net Billed (kWh)": hourly["net_kwh"].round(1),
+            "Bill Before (RM)": hourly["bill_before"],
+            "Bill After (RM)": hourly["bill_after"],
+        })
+        timer.lap("solar_hourly")
 
-    # Water tariffs (RM/m³) by state
-    water_tariffs = {
-        "Kuala Lumpur": 0.57,
-        "Selangor": 0.57,
-        "Perak": 0.50,
-        "Pahang": 0.48,
-        "Negeri Sembilan": 0.55,
-        "Johor": 0.60,
-        "Kelantan": 0.45,
-        "Terengganu": 0.47,
-        "Kedah": 0.52,
-        "Perlis": 0.49,
-        "Pulau Pinang": 0.50,
-        "Melaka": 0.53,
-        "Sarawak": 0.51,
-        "Sabah": 0.50
-    }
-    
     # Default User Input Value
-    if category == "Solar":
-        pass
-    elif category == "Water":
+    if category == "Water":
         monthly_usage = st.number_input("🚰 Monthly Water Usage (m³)", min_value=1, value=20, step=1)
         efficiency = st.slider("💧 Efficiency Improvement (%)", 1, 50, 20)
-        tariff = water_tariffs.get(state, 0.5)
-        monthly_bill = monthly_usage * tariff
-        monthly_savings_default = int(monthly_bill * (efficiency / 100))
-    else:
-        monthly_savings_default = 1000
-    
-    monthly_savings = st.number_input(
-        "⚡ Monthly Savings (RM)", 
-        min_value=1, 
-        value=int(monthly_savings_default), 
-        step=100
-    )
-    years = st.slider("⏳ Investment Horizon (Years)", 1, 10, 5)
-    
-    # ROI calculation
-    total_savings = monthly_savings * 12 * years
-    roi = ((total_savings - investment) / investment) * 100
-    payback_months = (investment / monthly_savings) if monthly_savings > 0 else float('inf')
-    payback_years = payback_months / 12 if payback_months != float('inf') else float('inf')
-    
-    st.subheader("📊 Results")
-    st.write(f"**Category:** {category}")
-    st.write(f"**Total Savings (over {years} years): RM {total_savings:,.2f}**")
-    st.write(f"**ROI: {roi:.2f}%**")
-    
-    if payback_months != float('inf'):
-        st.write(f"**Payback Period: {payback_months:.1f} months (~{payback_years:.1f} years)**")
-    else:
-        st.write("**Payback Period: N/A (monthly savings = 0)**")
-    
-    # Monthly savings chart data
-    np.random.seed(0)
-    months = np.arange(1, years * 12 + 1)
-    noise = np.random.normal(0, monthly_savings * 0.05, years * 12)
-    savings = np.cumsum(np.full(years * 12, monthly_savings) + noise)
-    
-    # Chart section
-    st.subheader("📊 Visualization Options")
-    chart_options = ["Cumulative Savings Over Time", "Investment vs. Total Savings"]
-    selected_charts = st.multiselect("Select chart(s) to display", chart_options)
-    fig1 = fig2 = None
-    
-    if "Cumulative Savings Over Time" in selected_charts or "Investment vs. Total Savings" in selected_charts:
-        col1, col2 = st.columns(2)
-    
-        if "Cumulative Savings Over Time" in selected_charts:
+        monthly_bill = float(roi_engine.water_bill(monthly_usage, state))
+        monthly_savings_default = roi_engine.water_savings(monthly_bill, efficiency)
+
+    # Everything below depends only on these inputs. Its widgets (savings, horizon,
+    # charts, simulations, export) rerun just this fragment, not the whole page.
+    @st.fragment
+    def roi_results(state, category, investment, monthly_savings_default, house_type, compare_kwh, compare_water):
+        results_timer = timing.start_rerun("app7.results")
+        monthly_savings = st.number_input(
+            "⚡ Monthly Savings (RM)", 
+            min_value=1, 
+            value=int(monthly_savings_default), 
+            step=100
+        )
+        years = st.slider("⏳ Investment Horizon (Years)", 1, 10, 5)
+
+        # ROI calculation
+        # Shared across sessions: the typical inputs are computed once per process
+        summary = scenario_cache.roi_summary(investment, monthly_savings, years)
+        total_savings = summary["total_savings"]
+        roi = summary["roi"]
+        payback_months = summary["payback_months"]
+        payback_years = summary["payback_years"]
+
+        st.subheader("📊 Results")
+        st.write(f"**Category:** {category}")
+        st.write(f"**Total Savings (over {years} years): RM {total_savings:,.2f}**")
+        st.write(f"**ROI: {roi:.2f}%**")
+
+        if payback_months != float('inf'):
+            st.write(f"**Payback Period: {payback_months:.1f} months (~{payback_years:.1f} years)**")
+        else:
+            st.write("**Payback Period: N/A (monthly savings = 0)**")
+
+        # Discounted cash flow: tariff escalation raises savings, panel degradation lowers them
+        with st.expander("💹 Discounted Cash Flow (NPV / IRR)"):
+            col1, col2, col3 = st.columns(3)
+            discount_rate = col1.slider("Discount rate (% per year)", 0.0, 15.0, 100 * cashflow.DEFAULT_DISCOUNT_RATE, 0.5) / 100
+            escalation = col2.slider("Tariff escalation (% per year)", 0.0, 10.0, 100 * cashflow.DEFAULT_ESCALATION, 0.5) / 100
+            default_degradation = cashflow.SOLAR_DEGRADATION if category == "Solar" else cashflow.DEFAULT_DEGRADATION
+            degradation = col3.slider("Panel degradation (% per year)", 0.0, 2.0, 100 * default_degradation, 0.1) / 100
+            dcf = scenario_cache.discounted_cash_flow(investment, monthly_savings, years, discount_rate, escalation, degradation)
+            npv, irr, discounted_payback = dcf["npv"], dcf["irr"], dcf["discounted_payback_months"]
+            col1, col2, col3 = st.columns(3)
+            col1.metric("NPV", f"RM {npv:,.2f}")
+            col2.metric("IRR", "N/A" if np.isnan(irr) else f"{irr:.2%}")
+            col3.metric("Discounted Payback", "N/A" if np.isinf(discounted_payback) else f"{discounted_payback:.0f} months")
+
+        # Monthly savings chart data
+        months, savings = summary["months"], summary["savings"]
+        results_timer.lap("roi")
+
+        # Chart section
+        st.subheader("📊 Visualization Options")
+        chart_options = [charts.CUMULATIVE_SAVINGS, charts.INVESTMENT_VS_SAVINGS]
+        selected_charts = st.multiselect("Select chart(s) to display", chart_options)
+
+        if selected_charts:
+            col1, col2 = st.columns(2)
+
+            if charts.CUMULATIVE_SAVINGS in selected_charts:
+                with col1:
+                    st.image(charts.cumulative_savings_png(state, category, investment, monthly_savings, years))
+
+            if charts.INVESTMENT_VS_SAVINGS in selected_charts:
+                with col2:
+                    st.image(charts.investment_vs_savings_png(state, category, investment, total_savings, years))
+        results_timer.lap("charts")
+
+        # Every state and both categories from the same inputs, in one vectorized pass
+        if st.checkbox("🗺️ Compare all states (Solar and Water)"):
+            col1, col2, col3 = st.columns(3)
+            compare_kwh = col1.number_input("Electricity use for comparison (kWh/month)", min_value=1, value=int(compare_kwh))
+            compare_water = col2.number_input("Water use for comparison (m³/month)", min_value=1, value=int(compare_water))
+            house_options = list(house_types.keys())
+            compare_house = col3.selectbox(
+                "House type for solar sizing", house_options,
+                index=house_options.index(house_type) if house_type in house_options else 0
+            )
+            table = scenario_cache.state_comparison(investment, years, compare_kwh, compare_water, compare_house)
+            payback = table["payback_months"]
+            st.dataframe({
+                "Rank": table["rank"],
+                "State": table["state"],
+                "Category": table["category"],
+                "Monthly Bill (RM)": np.round(table["monthly_bill"], 2),
+                "Monthly Savings (RM)": np.round(table["monthly_savings"], 2),
+                f"Total Savings over {years} yrs (RM)": np.round(table["total_savings"], 2),
+                "ROI (%)": np.round(table["roi"], 2),
+                "Payback (months)": np.where(np.isfinite(payback), np.round(payback, 1), np.nan),
+            }, hide_index=True)
+            st.caption("Solar savings use each state's hourly net-metering simulation; water savings use each state's tariff.")
+            st.image(charts.state_comparison_png(investment, years, compare_kwh, compare_water, compare_house))
+        results_timer.lap("state_comparison")
+
+        # Monte Carlo confidence bands
+        if st.checkbox("🎲 Simulate savings uncertainty (Monte Carlo)"):
+            n_paths = st.select_slider("Simulated paths", options=[1_000, 10_000, 100_000], value=10_000)
+            simulation = montecarlo.cached_simulation(monthly_savings, years, investment, n_paths)
+            col1, col2, col3 = st.columns(3)
+            col1.metric("P10 Total Savings", f"RM {simulation['p10'][-1]:,.0f}")
+            col2.metric("P50 Total Savings", f"RM {simulation['p50'][-1]:,.0f}")
+            col3.metric("P90 Total Savings", f"RM {simulation['p90'][-1]:,.0f}")
+            st.write(f"**Probability of payback within {years} years: {simulation['payback_probability']:.1%}**")
+            st.image(charts.savings_bands_png(state, category, investment, monthly_savings, years, n_paths))
+        results_timer.lap("monte_carlo")
+
+        # Sensitivity sweep over investment x monthly savings x horizon
+        if st.checkbox("🧮 Sensitivity analysis (ROI heatmap)"):
+            investment_range = st.slider("Investment range (RM)", 1000, 100000, (1000, min(max(2 * investment, 2000), 100000)), step=1000)
+            savings_range = st.slider("Monthly savings range (RM)", 1, 5000, (1, min(max(2 * monthly_savings, 2), 5000)), step=10)
+            steps = st.select_slider("Grid resolution", options=[50, 100, 200, 500], value=100)
+            heatmap_years = st.slider("Heatmap horizon (years)", 1, 10, years)
+            col1, col2 = st.columns(2)
             with col1:
-                fig1, ax1 = plt.subplots(figsize=(6, 4))
-                ax1.plot(months, savings, label="Cumulative Savings")
-                ax1.axhline(y=investment, linestyle="--", label="Initial Investment")
-                if monthly_savings > 0 and payback_months <= years * 12:
-                    ax1.axvline(x=payback_months, linestyle="--", label="Payback Period")
-                ax1.set_xlabel("Months")
-                ax1.set_ylabel("RM")
-                ax1.set_title(f"Monthly Cumulative Savings in {state} for {category}")
-                ax1.legend()
-                st.pyplot(fig1)
-    
-        if "Investment vs. Total Savings" in selected_charts:
+                st.image(charts.roi_heatmap_png(investment_range, savings_range, steps, heatmap_years))
             with col2:
-                fig2, ax2 = plt.subplots(figsize=(6, 4))
-                ax2.bar(["Initial Investment", f"Savings ({years} yrs)"], [investment, total_savings])
-                ax2.set_ylabel("RM")
-                ax2.set_title(f"Investment vs. Total Savings in {state} for {category}")
-                st.pyplot(fig2)
-    
-    # Export options
-    st.subheader("📤 Export Report")
-    export_format = st.selectbox("Choose format", ["CSV", "PDF"])
-    if st.button("Export Report"):
-        # Prepare dataframes
-        df_monthly = pd.DataFrame({"Month": months, "Cumulative Savings": savings})
-        df_yearly = df_monthly.groupby((df_monthly.index) // 12 + 1).last().reset_index(drop=True)
-        df_yearly.index += 1
-        df_yearly = df_yearly.rename(columns={"Cumulative Savings": "Yearly Cumulative Savings"})
-        df_yearly.insert(0, "Year", df_yearly.index)
-    
-        if export_format == "CSV":
-            csv_monthly = df_monthly.to_csv(index=False).encode("utf-8")
-            st.download_button(
-                "Download Monthly CSV", 
-                data=csv_monthly, 
-                file_name=f"roi_monthly_{state}_{category}.csv", 
-                mime="text/csv"
-            )
-            csv_yearly = df_yearly.to_csv(index=False).encode("utf-8")
-            st.download_button(
-                "Download Yearly CSV", 
-                data=csv_yearly, 
-                file_name=f"roi_yearly_{state}_{category}.csv", 
-                mime="text/csv"
-            )
-    
-        elif export_format == "PDF":
-            buffer = BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=A4)
-            styles = getSampleStyleSheet()
-            elements = []
-    
-            # Report text
-            elements.append(Paragraph("ROI Report - Green Investment", styles['Title']))
-            elements.append(Spacer(1, 12))
-            elements.append(Paragraph(f"State: {state}", styles['Normal']))
-            elements.append(Paragraph(f"Category: {category}", styles['Normal']))
-            elements.append(Paragraph(f"Initial Investment: RM {investment:,.2f}", styles['Normal']))
-            elements.append(Paragraph(f"Total Savings: RM {total_savings:,.2f}", styles['Normal']))
-            elements.append(Paragraph(f"ROI: {roi:.2f}%", styles['Normal']))
-    
-            if payback_months != float('inf'):
-                elements.append(Paragraph(f"Payback Period: {payback_months:.1f} months (~{payback_years:.1f} years)", styles['Normal']))
+                st.image(charts.roi_heatmap_png(investment_range, savings_range, steps, heatmap_years, "payback"))
+            if st.button("Prepare sensitivity table"):
+                st.download_button(
+                    "Download Sensitivity CSV",
+                    data=sensitivity.roi_csv(*sensitivity.grid_axes(investment_range, savings_range, steps), np.arange(1, 11)),
+                    file_name=f"roi_sensitivity_{state}_{category}.csv",
+                    mime="text/csv"
+                )
+        results_timer.lap("sensitivity")
+
+        # Export options
+        st.subheader("📤 Export Report")
+        export_format = st.selectbox("Choose format", [*export.FORMATS, "PDF"])
+        report_scenario = {
+            "state": state,
+            "category": category,
+            "investment": investment,
+            "monthly_savings": monthly_savings,
+            "years": years,
+        }
+        if st.session_state.get("pdf_scenario") != report_scenario:
+            st.session_state.pop("pdf_job", None)
+        st.session_state["pdf_scenario"] = report_scenario
+        if st.button("Export Report"):
+            if export_format in export.FORMATS:
+                for label, stem, columns in [
+                    ("Monthly", f"roi_monthly_{state}_{category}", export.monthly_columns(months, savings)),
+                    ("Yearly", f"roi_yearly_{state}_{category}", export.yearly_columns(savings)),
+                ]:
+                    st.download_button(
+                        f"Download {label} {export_format}",
+                        data=export.to_bytes(columns, export_format),
+                        file_name=export.filename(stem, export_format),
+                        mime=export.mime_type(export_format)
+                    )
+
+            elif export_format == "PDF":
+                st.session_state["pdf_job"] = reports.submit_pdf(report_scenario)
+
+        # The PDF is built on a worker thread; the page stays usable while a fragment polls for it
+        pdf_job = st.session_state.get("pdf_job")
+        if export_format == "PDF" and pdf_job is not None:
+            if pdf_job.done():
+                st.download_button(
+                    "Download PDF Report",
+                    data=pdf_job.result(),
+                    file_name=reports.report_filename(report_scenario),
+                    mime="application/pdf"
+                )
             else:
-                elements.append(Paragraph("Payback Period: N/A", styles['Normal']))
-    
-            elements.append(Spacer(1, 12))
-    
-            # Monthly table
-            max_rows_for_pdf = 120
-            monthly_rows = list(zip(months, savings))
-            if len(monthly_rows) > max_rows_for_pdf:
-                monthly_rows = monthly_rows[:max_rows_for_pdf]
-                monthly_rows.append(("...", "..."))
-    
-            data_monthly = [["Month", "Cumulative Savings"]] + [[m, f"RM {s:,.2f}"] for m, s in monthly_rows]
-            table_monthly = Table(data_monthly, colWidths=[100, 200])
-            monthly_style = TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.green),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ])
-            table_monthly.setStyle(monthly_style)
-            elements.append(Paragraph("Monthly Cumulative Savings (Partial)", styles['Heading2']))
-            elements.append(table_monthly)
-    
-            # Yearly table
-            data_yearly = [["Year", "Yearly Cumulative Savings"]] + [[y, f"RM {s:,.2f}"] for y, s in zip(df_yearly["Year"], df_yearly["Yearly Cumulative Savings"])]
-            table_yearly = Table(data_yearly, colWidths=[100, 200])
-            yearly_style = TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.blue),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ])
-            table_yearly.setStyle(yearly_style)
-            elements.append(Spacer(1, 12))
-            elements.append(Paragraph("Yearly Cumulative Savings", styles['Heading2']))
-            elements.append(table_yearly)
-    
-            doc.build(elements)
-            pdf = buffer.getvalue()
-            buffer.close()
-    
-            st.download_button(
-                "Download PDF Report",
-                data=pdf,
-                file_name=f"roi_report_{state}_{category}.pdf",
-                mime="application/pdf"
-            )
+                @st.fragment(run_every=reports.POLL_SECONDS)
+                def pdf_progress():
+                    # One full rerun when it is ready shows the download and stops the polling
+                    job = st.session_state.get("pdf_job")
+                    if job is None or job.done():
+                        st.rerun()
+                    st.info("⏳ Building PDF report... the download button appears here when it is ready.")
+
+                pdf_progress()
+        results_timer.lap("export")
+        timing.show_debug_panel(results_timer.finish(), st)
+
+    # Starting usage for the all-states comparison, whichever category is shown
+    compare_kwh = monthly_kwh if category == "Solar" else 400
+    compare_water = monthly_usage if category == "Water" else 20
+
+    timer.lap("inputs")
+    roi_results(state, category, investment, monthly_savings_default, house_type, compare_kwh, compare_water)
+    timer.lap("results")
+
+timing.show_debug_panel(timer.finish())
@@ -0,0 +1,58 @@
+"""AI Green Advisor cache and coalescing under concurrent load.
+
+Starts the local stub OpenAI server, fires concurrent questions drawn from a
+small pool (so many are repeats, some in flight at the same time) and
+reports hit rate, coalesced requests, upstream calls and latency.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_advisor
+"""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub_openai import start_stub_server, stub_answer
+from green_finance.advisor import AnswerCache, GreenAdvisor, normalize_question
+
+QUESTIONS = [
+    "What tax incentives exist for solar in Malaysia?",
+    "How do I apply for GTFS?",
+    "Is rainwater harvesting worth it for a factory?",
+    "What is net energy metering?",
+    "Which states have the best solar irradiation?",
+]
+
+
+def main(n_requests=400, concurrency=32, token_delay=0.005, seed=0):
+    import openai  # noqa: F401  keep the one-off import out of the latency numbers
+
+    server = start_stub_server(token_delay=token_delay)
+    advisor = GreenAdvisor(cache=AnswerCache(), base_url=server.base_url)
+    rng = random.Random(seed)
+    # Vary case, spacing and punctuation so normalization is exercised
+    asked = [rng.choice(QUESTIONS) for _ in range(n_requests)]
+    asked = [q.upper() if i % 3 == 0 else q.rstrip("?") + "  ?" if i % 3 == 1 else q for i, q in enumerate(asked)]
+
+    def ask(question):
+        return "".join(advisor.ask(question, api_key="stub-key"))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        answers = list(pool.map(ask, asked))
+
+    prefix = stub_answer("")
+    for question, answer in zip(asked, answers):
+        assert answer.startswith(prefix), answer
+        assert normalize_question(answer[len(prefix):]) == normalize_question(question), (question, answer)
+
+    stats = advisor.stats()
+    print(f"requests          : {stats['requests']}")
+    print(f"cache hits        : {stats['hits']} ({stats['hit_rate']:.1%})")
+    print(f"coalesced         : {stats['coalesced']}")
+    print(f"upstream calls    : {stats['upstream']} (stub served {server.requests})")
+    print(f"latency p50 / p99 : {stats['latency_p50_ms']:.1f} / {stats['latency_p99_ms']:.1f} ms")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Throughput of the local JSON API (``green_finance.api``).
+
+A server is started in-process on a free port and ``--clients`` threads
+send requests over ``http.client``, each reusing one keep-alive connection
+(or opening one per request with ``--no-keepalive``).  Reports requests/s
+and p50/p99 latency for a single-scenario call and a batch call.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_api
+    python -m benchmarks.bench_api --clients 16 --requests 500
+    python -m benchmarks.bench_api --no-keepalive
+"""
+
+import argparse
+import http.client
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from green_finance import api, reference
+
+SINGLE = {
+    "state": "Johor", "category": "Solar", "house_type": "Terrace House",
+    "monthly_bill": 300, "investment": 20000, "years": 5,
+}
+BATCH_ROWS = 1000
+
+
+def _batch(rows=BATCH_ROWS, seed=0):
+    rng = np.random.default_rng(seed)
+    return {"columns": {
+        "state": rng.choice(list(reference.solar_data), rows).tolist(),
+        "category": rng.choice(["Solar", "Water"], rows).tolist(),
+        "house_type": rng.choice(list(reference.house_types), rows).tolist(),
+        "monthly_bill": np.round(rng.uniform(10, 2500, rows), 2).tolist(),
+        "investment": rng.integers(1000, 50000, rows).tolist(),
+        "years": rng.integers(1, 11, rows).tolist(),
+    }}
+
+
+def _client(port, path, body, requests, keepalive):
+    latencies = []
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    headers = {"Content-Type": "application/json"}
+    for _ in range(requests):
+        if not keepalive:
+            connection.close()
+            connection = http.client.HTTPConnection("127.0.0.1", port)
+        started = time.perf_counter()
+        connection.request("POST", path, body, headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append((time.perf_counter() - started) * 1000)
+        if response.status != 200:
+            raise RuntimeError(f"{path}: HTTP {response.status}")
+    connection.close()
+    return latencies
+
+
+def run(port, path, payload, clients, requests, keepalive):
+    body = api.dumps(payload)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(lambda _: _client(port, path, body, requests, keepalive), range(clients)))
+    elapsed = time.perf_counter() - started
+    latencies = np.concatenate(results)
+    return len(latencies) / elapsed, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--no-keepalive", action="store_true", help="open a new connection per request")
+    args = parser.parse_args(argv)
+
+    server = api.make_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_port
+    keepalive = not args.no_keepalive
+    encoder = "orjson" if api.orjson is not None else "json"
+    print(f"{args.clients} clients x {args.requests} requests, keep-alive {'on' if keepalive else 'off'}, {encoder}")
+    try:
+        for label, path, payload, rows in (
+            ("single scenario", "/scenario", SINGLE, 1),
+            (f"batch of {BATCH_ROWS:,}", "/scenarios", _batch(), BATCH_ROWS),
+        ):
+            run(port, path, payload, 1, 5, keepalive)  # warm-up
+            per_s, p50, p99 = run(port, path, payload, args.clients, args.requests, keepalive)
+            print(f"{label:<16} {per_s:9,.0f} req/s ({per_s * rows:11,.0f} scenarios/s)  p50 {p50:6.2f} ms  p99 {p99:6.2f} ms")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Advisor intent matching: original if/elif chain vs. IntentMatcher.
+
+Matches 100k questions against the built-in table and against a synthetic
+table of several hundred FAQ intents to show matching cost stays flat as
+the table grows.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_intents
+"""
+
+import random
+import time
+
+from green_finance.intents import DEFAULT_INTENTS, IntentMatcher
+
+WORDS = ("how do i get a solar loan for my factory what is the payback on rainwater "
+         "harvesting does esg reporting help android app for energy tracking in selangor").split()
+
+
+def if_elif_chain(question):
+    """The rule layer as it was written in EY1.0.py (substring checks)."""
+    ql = question.lower().strip()
+    if "loan" in ql or "finance" in ql:
+        return "financing"
+    elif "roi" in ql or "payback" in ql:
+        return "roi"
+    elif "esg" in ql:
+        return "esg"
+    return None
+
+
+def substring_scan(intents):
+    """The if/elif approach extended to a whole table: one check per keyword."""
+    def match(question):
+        ql = question.lower().strip()
+        for intent in intents:
+            if any(keyword.rstrip("*") in ql for keyword in intent["keywords"]):
+                return intent["name"]
+        return None
+    return match
+
+
+def synthetic_faq(n):
+    intents = list(DEFAULT_INTENTS)
+    for i in range(n):
+        intents.append({
+            "name": f"faq{i}",
+            "keywords": [f"topic{i}", f"subject{i} detail"],
+            "answer": f"Answer {i}",
+            "priority": 10,
+        })
+    return intents
+
+
+def timed(fn, questions):
+    start = time.perf_counter()
+    for question in questions:
+        fn(question)
+    return time.perf_counter() - start
+
+
+def main(n_questions=100_000, seed=0):
+    rng = random.Random(seed)
+    questions = [" ".join(rng.choices(WORDS, k=rng.randint(4, 14))) for _ in range(n_questions)]
+
+    chain_s = timed(if_elif_chain, questions)
+    print(f"if/elif chain   (3 rules)    : {chain_s * 1e6 / n_questions:7.2f} us/question")
+    for n_faq in (0, 100, 500):
+        intents = synthetic_faq(n_faq)
+        # Questions with no intent pay for every check in a chain
+        scan_s = timed(substring_scan(intents[::-1]), questions)
+        matcher_s = timed(IntentMatcher(intents).match, questions)
+        print(f"substring chain ({len(intents):>3} intents): {scan_s * 1e6 / n_questions:7.2f} us/question")
+        print(f"IntentMatcher   ({len(intents):>3} intents): {matcher_s * 1e6 / n_questions:7.2f} us/question")
+
+    misfires = sum(1 for q in questions if if_elif_chain(q) == "roi" and IntentMatcher().match(q) is None)
+    print(f"substring misfires avoided   : {misfires:,} of {n_questions:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Monte Carlo savings simulation throughput.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_montecarlo
+"""
+
+import time
+
+from green_finance.montecarlo import simulate_savings
+
+
+def main(monthly_savings=260, investment=5000, repeat=3):
+    for years in (5, 10):
+        for n_paths in (10_000, 100_000):
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                result = simulate_savings(monthly_savings, years, investment, n_paths=n_paths, seed=0)
+                best = min(best, time.perf_counter() - start)
+            print(f"{years:2d} yrs x {n_paths:>7,} paths: {best * 1000:8.1f} ms "
+                  f"(P50 total RM {result['p50'][-1]:,.0f}, payback {result['payback_probability']:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""ROI sensitivity grid sweep throughput.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_sensitivity
+"""
+
+import time
+
+import numpy as np
+
+from green_finance import sensitivity
+
+
+def main(steps=1000, repeat=3):
+    investment, monthly_savings = sensitivity.grid_axes((1000, 100000), (10, 5000), steps)
+    years = np.arange(1, 11)
+    for slice_size in (32, sensitivity.DEFAULT_SLICE, 512):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            grid = sensitivity.roi_grid(investment, monthly_savings, years, slice_size=slice_size)
+            best = min(best, time.perf_counter() - start)
+        print(f"{steps}x{steps}x{len(years)} grid, slice {slice_size:>3}: {best * 1000:7.1f} ms "
+              f"({grid['roi'].nbytes / 1e6:.0f} MB result)")
+
+
+if __name__ == "__main__":
+    main()
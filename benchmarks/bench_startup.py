@@ -0,0 +1,104 @@
+"""Cold-start import cost of each app, measured with ``python -X importtime``.
+
+Only the module-level imports of each app script are replayed, in a fresh
+interpreter, so the numbers reflect what every new server process pays
+before the first page renders.  Results are compared against
+``startup_baseline.json``; the run fails if a deferred dependency is
+imported at startup again or the total import time regresses.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup            # check against baseline
+    python -m benchmarks.bench_startup --update   # rewrite the baseline
+"""
+
+import argparse
+import ast
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE = Path(__file__).resolve().parent / "startup_baseline.json"
+APPS = ["app7.0.py", "EY1.0.py"]
+
+# Loaded on first use of their feature, never at startup
+DEFERRED = ["pandas", "pyarrow", "joblib", "matplotlib", "reportlab", "sklearn", "openai"]
+TOLERANCE = 1.5
+REPEAT = 3
+
+
+def startup_imports(app):
+    """Source of the module-level import statements of an app script."""
+    tree = ast.parse((ROOT / app).read_text(encoding="utf-8"))
+    nodes = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.unparse(node) for node in nodes)
+
+
+def importtime(source):
+    """Cost (us) of each import made directly by ``source``, and every module loaded."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", source],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    packages, modules = {}, set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.add(name.strip())
+        if name.startswith("  "):
+            continue  # nested import, already counted in its parent
+        packages[name.strip()] = packages.get(name.strip(), 0) + int(cumulative)
+    return packages, modules
+
+
+def measure(app, interpreter):
+    source = startup_imports(app)
+    runs, loaded = [], set()
+    for _ in range(REPEAT):
+        packages, modules = importtime(source)
+        runs.append({name: us for name, us in packages.items() if name not in interpreter})
+        loaded.update(name.split(".")[0] for name in modules)
+    best = min(runs, key=lambda packages: sum(packages.values()))
+    top = sorted(best.items(), key=lambda item: item[1], reverse=True)[:10]
+    return {
+        "total_us": sum(best.values()),
+        "top_imports_us": dict(top),
+        "deferred_loaded": sorted(name for name in DEFERRED if name in loaded),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--update", action="store_true", help="rewrite the checked-in baseline")
+    args = parser.parse_args(argv)
+
+    interpreter = importtime("pass")[1]  # paid by every process, app or not
+    report = {app: measure(app, interpreter) for app in APPS}
+    for app, result in report.items():
+        print(f"{app}: {result['total_us'] / 1000:8.1f} ms")
+        for name, us in result["top_imports_us"].items():
+            print(f"    {name:<30} {us / 1000:8.1f} ms")
+
+    if args.update:
+        BASELINE.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline written to {BASELINE.name}")
+        return 0
+
+    baseline = json.loads(BASELINE.read_text(encoding="utf-8"))
+    failures = []
+    for app, result in report.items():
+        if result["deferred_loaded"]:
+            failures.append(f"{app} imports {', '.join(result['deferred_loaded'])} at startup")
+        limit = baseline[app]["total_us"] * TOLERANCE
+        if result["total_us"] > limit:
+            failures.append(f"{app} startup imports took {result['total_us']} us (limit {limit:.0f} us)")
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
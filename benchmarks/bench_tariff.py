@@ -0,0 +1,76 @@
+"""Tariff inversion: original linear kWh scan vs. TariffEngine.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_tariff
+"""
+
+import time
+
+import numpy as np
+
+from green_finance.tariff import TariffEngine
+
+tariffs_tiers = [
+    (1, 200, 0.218),
+    (201, 300, 0.334),
+    (301, 600, 0.516),
+    (601, 900, 0.546),
+    (901, float('inf'), 0.571)
+]
+
+
+# Verbatim copies of the functions that used to live in the app tabs.
+def calculate_bill_from_kwh(kwh):
+    bill = 0.0
+    remaining = kwh
+    for low, high, rate in tariffs_tiers:
+        limit = high - low + 1 if high != float('inf') else float('inf')
+        use = min(remaining, limit)
+        if use <= 0:
+            continue
+        bill += use * rate
+        remaining -= use
+        if remaining <= 0:
+            break
+    return round(bill, 2)
+
+
+def calculate_kwh_from_bill(target_bill, max_kwh=5000):
+    for kwh in range(1, max_kwh + 1):
+        if calculate_bill_from_kwh(kwh) >= target_bill:
+            return kwh
+    return max_kwh
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(n_loop=200, n_vector=1_000_000, seed=0):
+    engine = TariffEngine(tariffs_tiers)
+    rng = np.random.default_rng(seed)
+    bills = np.round(rng.uniform(10, 2500, n_vector), 2)
+    sample = bills[:n_loop]
+
+    loop_s, loop_kwh = timed(lambda: [calculate_kwh_from_bill(b) for b in sample], repeat=1)
+    scalar_s, scalar_kwh = timed(lambda: [engine.kwh_from_bill(b, max_kwh=5000) for b in sample])
+    vector_s, vector_kwh = timed(lambda: engine.kwh_from_bill(bills, max_kwh=5000))
+
+    assert loop_kwh == scalar_kwh == vector_kwh[:n_loop].tolist()
+
+    per_loop = loop_s / n_loop
+    per_scalar = scalar_s / n_loop
+    per_vector = vector_s / n_vector
+    print(f"linear scan      : {per_loop * 1e6:12.2f} us/bill ({n_loop} bills)")
+    print(f"engine (scalar)  : {per_scalar * 1e6:12.2f} us/bill  x{per_loop / per_scalar:,.0f}")
+    print(f"engine (vector)  : {per_vector * 1e6:12.4f} us/bill  x{per_loop / per_vector:,.0f} ({n_vector:,} bills)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""Concurrent browser sessions of both apps against one real Streamlit server.
+
+Each app is served by ``streamlit run`` in a child process, and
+``--sessions`` clients connect to it over the same websocket protocol the
+browser speaks, all at once from one event loop.  The server runs every
+session's script on its own thread, so reruns genuinely overlap and share
+the process-wide scenario cache, as on a busy deployment.  A session reruns
+its app ``--reruns`` times, each time switching to one of ``TYPICAL`` inputs
+picked with weights ``1 / rank`` (most visitors keep the defaults).  The
+report gives reruns per second, p50/p99 rerun latency (widget change sent
+to script finished) and the hit rate of every scenario cache, which the
+server writes out when it shuts down.
+
+Run from the repository root:
+
+    python -m benchmarks.load_test                         # 8 sessions x 20 reruns per app
+    python -m benchmarks.load_test --sessions 32 --reruns 50
+    python -m benchmarks.load_test --no-cache              # same load, caches off
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+SERVER_START_TIMEOUT = 60
+
+# (state, category, house type, monthly bill RM, years), most common first
+TYPICAL = [
+    ("Johor", "Solar", "Terrace House", 300, 5),
+    ("Selangor", "Solar", "Terrace House", 300, 5),
+    ("Kuala Lumpur", "Water", None, 300, 5),
+    ("Johor", "Solar", "Semi-detached", 500, 10),
+    ("Pulau Pinang", "Solar", "Terrace House", 200, 5),
+    ("Sabah", "Water", None, 100, 3),
+    ("Selangor", "Solar", "Bungalow", 900, 10),
+    ("Kedah", "Water", None, 150, 5),
+]
+
+# Widget labels per app: (state, category, house type, bill, years)
+APPS = {
+    "app7.0.py": ("🏙️ Select Your State", "Select Investment Category", "🏠 House Type",
+                  "Enter your monthly bill (RM)", "⏳ Investment Horizon (Years)"),
+    "EY1.0.py": ("🏙️ Select State", "Investment Category", "🏠 House Type",
+                 "Enter your monthly bill", "⏳ Years"),
+}
+
+
+# ---------- server side ----------
+def serve(script, port, stats_path):
+    """Run ``script`` under Streamlit; write the scenario cache stats on shutdown."""
+    from streamlit.web import bootstrap
+
+    from green_finance import scenario_cache
+
+    flags = {
+        "server_port": port,
+        "server_headless": True,
+        "server_fileWatcherType": "none",
+        "browser_gatherUsageStats": False,
+        "logger_level": "error",
+    }
+    bootstrap.load_config_options(flags)
+    try:
+        bootstrap.run(str(ROOT / script), False, [], flags)
+    finally:
+        with open(stats_path, "w", encoding="utf-8") as f:
+            json.dump(scenario_cache.stats(), f)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(port, process):
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server not ready after {SERVER_START_TIMEOUT} s")
+
+
+# ---------- client side ----------
+class Session:
+    """One browser tab: sends widget states, waits for the rerun to finish."""
+
+    def __init__(self, websocket):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        self._websocket = websocket
+        self._forward_msg = ForwardMsg
+        self._sent = {}  # hash -> cached ForwardMsg, for the server's reference messages
+        self.widgets = {}  # label -> (element type, proto) from the latest run
+        self.states = {}  # widget id -> WidgetState
+
+    async def run(self):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+
+        back = BackMsg()
+        back.rerun_script.query_string = ""
+        back.rerun_script.widget_states.widgets.extend(self.states.values())
+        await self._websocket.write_message(back.SerializeToString(), binary=True)
+        error = None
+        while True:
+            payload = await self._websocket.read_message()
+            if payload is None:
+                raise RuntimeError("server closed the session")
+            msg = self._forward_msg.FromString(payload)
+            kind = msg.WhichOneof("type")
+            if kind == "ref_hash":
+                msg = self._sent[msg.ref_hash]
+                kind = msg.WhichOneof("type")
+            elif msg.hash:
+                self._sent[msg.hash] = msg
+            if kind == "new_session":
+                self.widgets = {}
+            elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "exception":
+                    error = error or element.exception.message
+                elif element_type in ("selectbox", "number_input", "slider"):
+                    proto = getattr(element, element_type)
+                    self.widgets[proto.label] = (element_type, proto)
+            elif kind == "script_finished":
+                if error:
+                    raise RuntimeError(error)
+                return
+
+    def set(self, label, value):
+        """Set a widget shown in the latest run; False when it is not on the page."""
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        if label not in self.widgets:
+            return False
+        element_type, proto = self.widgets[label]
+        state = WidgetState(id=proto.id)
+        if element_type == "selectbox":
+            state.int_value = list(proto.options).index(value)
+        elif element_type == "number_input":
+            state.double_value = value
+        else:
+            state.double_array_value.data[:] = [value]
+        self.states[proto.id] = state
+        return True
+
+    def value(self, label):
+        element_type, proto = self.widgets[label]
+        state = self.states.get(proto.id)
+        return proto.options[state.int_value if state else proto.default]
+
+
+async def _apply(session, labels, scenario):
+    """Set the scenario's inputs on the widgets the page currently shows."""
+    state_label, category_label, house_label, bill_label, years_label = labels
+    state, category, house_type, bill, years = scenario
+    session.set(state_label, state)
+    if session.value(category_label) != category:
+        # Category decides which inputs exist; switch first, then fill them in
+        session.set(category_label, category)
+        await session.run()
+    if house_type is not None:
+        session.set(house_label, house_type)
+    session.set(bill_label, bill)
+    session.set(years_label, years)
+
+
+async def run_session(port, script, reruns, seed):
+    """Latencies (ms) of ``reruns`` timed reruns of one session."""
+    from tornado.websocket import websocket_connect
+
+    websocket = await websocket_connect(f"ws://127.0.0.1:{port}/_stcore/stream", max_message_size=1 << 30)
+    try:
+        session = Session(websocket)
+        await session.run()
+        rng = np.random.default_rng(seed)
+        weights = 1 / np.arange(1, len(TYPICAL) + 1)
+        picks = rng.choice(len(TYPICAL), reruns, p=weights / weights.sum())
+        latencies = []
+        for pick in picks:
+            await _apply(session, APPS[script], TYPICAL[pick])
+            started = time.perf_counter()
+            await session.run()
+            latencies.append((time.perf_counter() - started) * 1000)
+        return latencies
+    finally:
+        websocket.close()
+
+
+async def _run_sessions(port, script, sessions, reruns):
+    return await asyncio.gather(*(run_session(port, script, reruns, seed) for seed in range(sessions)))
+
+
+def load_test(script, sessions, reruns, cache=True):
+    port = _free_port()
+    env = dict(os.environ)
+    if not cache:
+        env["GREEN_FINANCE_CACHE_ENTRIES"] = "0"
+    with tempfile.TemporaryDirectory() as tmp:
+        stats_path = os.path.join(tmp, "cache_stats.json")
+        process = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.load_test", "--serve", script, "--port", str(port), "--stats", stats_path],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL,
+        )
+        try:
+            _wait_ready(port, process)
+            started = time.perf_counter()
+            results = asyncio.run(_run_sessions(port, script, sessions, reruns))
+            elapsed = time.perf_counter() - started
+        finally:
+            process.send_signal(signal.SIGTERM)
+            process.wait(timeout=SERVER_START_TIMEOUT)
+        with open(stats_path, encoding="utf-8") as f:
+            counters = json.load(f)
+
+    latencies = np.concatenate(results)
+    caches = {}
+    for name, stats in counters.items():
+        lookups = stats["hits"] + stats["misses"]
+        if lookups:
+            caches[name] = (stats["hits"], lookups)
+    return {
+        "reruns": len(latencies),
+        "elapsed_s": elapsed,
+        "reruns_per_s": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "mean_ms": statistics.fmean(latencies),
+        "caches": caches,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent sessions per app")
+    parser.add_argument("--reruns", type=int, default=20, help="timed reruns per session")
+    parser.add_argument("--app", action="append", choices=list(APPS), help="app(s) to drive (default both)")
+    parser.add_argument("--no-cache", action="store_true", help="disable the scenario caches")
+    parser.add_argument("--serve", choices=list(APPS), help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--stats", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        return serve(args.serve, args.port, args.stats)
+    print(f"{args.sessions} sessions x {args.reruns} reruns, scenario cache {'off' if args.no_cache else 'on'}")
+    for script in args.app or list(APPS):
+        result = load_test(script, args.sessions, args.reruns, cache=not args.no_cache)
+        print(f"{script:<10} {result['reruns']:>5} reruns in {result['elapsed_s']:6.1f} s  "
+              f"{result['reruns_per_s']:7.1f} reruns/s  p50 {result['p50_ms']:7.1f} ms  p99 {result['p99_ms']:7.1f} ms")
+        for name, (hits, lookups) in sorted(result["caches"].items()):
+            print(f"    cache {name:<11} {hits:>6,} / {lookups:<6,} hits ({hits / lookups:.0%})")
+
+
+if __name__ == "__main__":
+    main()
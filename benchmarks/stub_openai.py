@@ -0,0 +1,94 @@
+"""Local stand-in for the OpenAI chat completions endpoint.
+
+Streams a canned answer token by token as server-sent events, with a
+configurable per-token delay, and counts the requests it serves.  Point
+``GreenAdvisor(base_url=...)`` at it, or run it standalone:
+
+    python -m benchmarks.stub_openai --port 8901
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def stub_answer(question):
+    return f"Stub advisor answer to: {question}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def handle(self):
+        try:
+            super().handle()
+        except ConnectionResetError:
+            pass  # client dropped a keep-alive connection
+
+    def _send_chunk(self, data):
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _event(self, payload):
+        self._send_chunk(f"data: {json.dumps(payload)}\n\n".encode())
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:
+            server.requests += 1
+        question = body["messages"][-1]["content"]
+        tokens = stub_answer(question).split(" ")
+        base = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time.time()), "model": body["model"]}
+
+        if not body.get("stream"):
+            time.sleep(server.token_delay * len(tokens))
+            message = {"role": "assistant", "content": " ".join(tokens)}
+            data = json.dumps(dict(base, object="chat.completion", choices=[
+                {"index": 0, "message": message, "finish_reason": "stop"}
+            ])).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i, token in enumerate(tokens):
+            time.sleep(server.token_delay)
+            content = token if i == 0 else " " + token
+            self._event(dict(base, choices=[{"index": 0, "delta": {"content": content}, "finish_reason": None}]))
+        self._event(dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+        self._send_chunk(b"data: [DONE]\n\n")
+        self._send_chunk(b"")
+
+
+def start_stub_server(port=0, token_delay=0.01):
+    """Start the stub on a daemon thread; returns the server (``.requests``, ``.base_url``)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.token_delay = token_delay
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    args = parser.parse_args()
+    server = start_stub_server(args.port, args.token_delay)
+    print(f"stub OpenAI endpoint at {server.base_url}")
+    threading.Event().wait()
@@ -0,0 +1,354 @@
+"""Benchmark suite for the calculator hot paths and full-page reruns.
+
+Every case runs a fixed workload with fixed seeds; each is timed ``REPEAT``
+times and the median per-call time is compared with ``baseline.json``.
+A case fails when it is more than ``TOLERANCE`` times slower than its
+baseline (and slower by more than ``NOISE_FLOOR_US`` in absolute terms).
+
+App reruns go through ``streamlit.testing.v1.AppTest``, which runs the
+script, fragments included, without a browser session.
+
+Run from the repository root:
+
+    python -m benchmarks.suite                 # compare against baseline.json
+    python -m benchmarks.suite --update        # rewrite baseline.json
+    python -m benchmarks.suite -k tariff       # only cases whose name contains "tariff"
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+REPEAT = 5
+TOLERANCE = 1.5
+NOISE_FLOOR_US = 20.0
+
+CASES = {}
+
+
+def case(name, number=1):
+    """Register ``setup() -> fn``; ``fn`` is timed ``number`` calls at a time."""
+    def register(setup):
+        CASES[name] = (setup, number)
+        return setup
+    return register
+
+
+def _bills(n, seed=0):
+    return np.round(np.random.default_rng(seed).uniform(10, 2500, n), 2)
+
+
+# ---------- tariff engine ----------
+@case("tariff.bill_from_kwh.scalar", number=1000)
+def _():
+    from green_finance.reference import tariff_engine
+    return lambda: tariff_engine.bill_from_kwh(400)
+
+
+@case("tariff.bill_from_kwh.vector_1m")
+def _():
+    from green_finance.reference import tariff_engine
+    kwh = np.random.default_rng(0).uniform(1, 5000, 1_000_000)
+    return lambda: tariff_engine.bill_from_kwh(kwh)
+
+
+@case("tariff.kwh_from_bill.scalar", number=1000)
+def _():
+    from green_finance.reference import tariff_engine
+    return lambda: tariff_engine.kwh_from_bill(300)
+
+
+@case("tariff.kwh_from_bill.vector_1m")
+def _():
+    from green_finance.reference import tariff_engine
+    bills = _bills(1_000_000)
+    return lambda: tariff_engine.kwh_from_bill(bills)
+
+
+@case("tariff.solar_savings.vector_1m")
+def _():
+    from green_finance.reference import tariff_engine
+    rng = np.random.default_rng(0)
+    consumption, offset = rng.uniform(1, 3000, 1_000_000), rng.uniform(0, 1500, 1_000_000)
+    return lambda: tariff_engine.solar_savings(consumption, offset)
+
+
+# ---------- ROI math ----------
+@case("roi.roi_metrics.scalar", number=1000)
+def _():
+    from green_finance.roi import roi_metrics
+    return lambda: roi_metrics(5000, 260, 5)
+
+
+@case("roi.roi_metrics.vector_1m")
+def _():
+    from green_finance.roi import roi_metrics
+    rng = np.random.default_rng(0)
+    investment, savings, years = rng.uniform(1000, 50000, 1_000_000), rng.uniform(1, 2000, 1_000_000), rng.integers(1, 11, 1_000_000)
+    return lambda: roi_metrics(investment, savings, years)
+
+
+@case("roi.evaluate_portfolio.100k")
+def _():
+    from green_finance import reference
+    from green_finance.roi import evaluate_portfolio
+    rng = np.random.default_rng(0)
+    n = 100_000
+    scenarios = {
+        "state": rng.choice(list(reference.solar_data), n),
+        "category": rng.choice(["Solar", "Water"], n),
+        "house_type": rng.choice(list(reference.house_types), n),
+        "monthly_bill": np.where(rng.random(n) < 0.5, _bills(n), np.nan),
+        "monthly_consumption": rng.uniform(1, 2000, n),
+        "investment": rng.uniform(1000, 50000, n),
+        "years": rng.integers(1, 11, n),
+    }
+    return lambda: evaluate_portfolio(scenarios)
+
+
+@case("bulk.score_csv.100k")
+def _():
+    import io
+    import pandas as pd
+    from green_finance import bulk, prediction, reference
+    rng = np.random.default_rng(0)
+    n = 100_000
+    prediction.load_roi_model()  # load the model outside the timing
+    source = pd.DataFrame({
+        "state": rng.choice(list(reference.solar_data), n),
+        "category": rng.choice(["Solar", "Water"], n),
+        "house_type": rng.choice(list(reference.house_types), n),
+        "monthly_bill": np.where(rng.random(n) < 0.5, _bills(n), np.nan),
+        "monthly_consumption": rng.uniform(1, 2000, n).round(1),
+        "investment": rng.integers(1000, 50000, n),
+        "years": rng.integers(1, 11, n),
+    }).to_csv(index=False)
+    return lambda: bulk.score_csv(io.StringIO(source), io.StringIO())
+
+
+@case("prediction.predict_roi.100k")
+def _():
+    from green_finance import prediction, reference
+    rng = np.random.default_rng(0)
+    n = 100_000
+    scenarios = {
+        "state": rng.choice(list(reference.solar_data), n),
+        "category": rng.choice(["Solar", "Water"], n),
+        "house_type": rng.choice(list(reference.house_types), n),
+        "monthly_bill": _bills(n),
+        "investment": rng.integers(1000, 50000, n).astype(float),
+        "years": rng.integers(1, 11, n),
+    }
+    prediction.load_roi_model()
+    return lambda: prediction.predict_roi(scenarios)
+
+
+@case("solar.simulate.10k")
+def _():
+    from green_finance import reference, solar
+    rng = np.random.default_rng(0)
+    n = 10_000
+    state = rng.choice(list(reference.solar_data), n)
+    system_kw, monthly_kwh = rng.uniform(4, 13, n), rng.uniform(100, 2000, n)
+    solar.state_profiles()  # write the profile file outside the timing
+    return lambda: solar.simulate(state, system_kw, monthly_kwh)
+
+
+@case("compare.states", number=20)
+def _():
+    from green_finance import compare, solar
+    solar.state_profiles()
+    return lambda: compare.compare_states(20000, 5, 725, 20, "Terrace House")
+
+
+@case("optimizer.npv.20k")
+def _():
+    from green_finance import optimizer, reference
+    rng = np.random.default_rng(1)
+    n = 20_000
+    candidates = {
+        "state": rng.choice(list(reference.solar_data), n),
+        "category": rng.choice(["Solar", "Water"], n),
+        "house_type": rng.choice(list(reference.house_types), n),
+        "monthly_bill": _bills(n),
+        "investment": rng.integers(1000, 50000, n).astype(float),
+        "years": rng.integers(1, 11, n),
+    }
+    return lambda: optimizer.optimize(candidates, n * 2000.0, optimizer.NPV, workers=1)
+
+
+@case("cashflow.evaluate.100k")
+def _():
+    from green_finance import cashflow
+    rng = np.random.default_rng(2)
+    n = 100_000
+    investment, monthly_savings = rng.uniform(5000, 60000, n), rng.uniform(20, 800, n)
+    years, discount_rate = rng.integers(1, 26, n), rng.uniform(0, 0.1, n)
+    escalation, degradation = rng.uniform(0, 0.05, n), rng.uniform(0, 0.01, n)
+    return lambda: cashflow.evaluate(investment, monthly_savings, years, discount_rate, escalation, degradation)
+
+
+# ---------- export ----------
+def _monthly_frame(years=10):
+    import pandas as pd
+    from green_finance.roi import cumulative_savings
+    months, savings = cumulative_savings(260, years)
+    return pd.DataFrame({"Month": months, "Cumulative Savings": savings})
+
+
+@case("export.yearly_groupby", number=100)
+def _():
+    df_monthly = _monthly_frame()
+
+    def yearly():
+        df_yearly = df_monthly.groupby((df_monthly.index) // 12 + 1).last().reset_index(drop=True)
+        df_yearly.index += 1
+        df_yearly = df_yearly.rename(columns={"Cumulative Savings": "Yearly Cumulative Savings"})
+        df_yearly.insert(0, "Year", df_yearly.index)
+        return df_yearly
+    return yearly
+
+
+@case("export.csv_monthly", number=100)
+def _():
+    df_monthly = _monthly_frame()
+    return lambda: df_monthly.to_csv(index=False).encode("utf-8")
+
+
+@case("export.yearly_reshape", number=100)
+def _():
+    from green_finance import export
+    from green_finance.roi import cumulative_savings
+    _, savings = cumulative_savings(260, 10)
+    return lambda: export.yearly_columns(savings)
+
+
+def _export_scenarios():
+    return [
+        {"state": "Johor", "category": "Solar", "monthly_savings": 200 + i % 500, "years": 1 + i % 10}
+        for i in range(10_000)
+    ]
+
+
+def _export_case(fmt):
+    from green_finance import export
+    monthly, _ = export.scenario_columns(_export_scenarios())
+    return lambda: export.to_bytes(monthly, fmt)
+
+
+@case("export.scenario_columns.10k")
+def _():
+    from green_finance import export
+    scenarios = _export_scenarios()
+    return lambda: export.scenario_columns(scenarios)
+
+
+@case("export.csv.10k_scenarios")
+def _():
+    return _export_case("CSV")
+
+
+@case("export.parquet.10k_scenarios")
+def _():
+    return _export_case("Parquet")
+
+
+@case("export.arrow.10k_scenarios")
+def _():
+    return _export_case("Arrow")
+
+
+@case("export.pdf_build")
+def _():
+    from green_finance import reports
+    scenario = {"state": "Johor", "category": "Solar", "investment": 5000, "monthly_savings": 260, "years": 10}
+    reports.build_pdf(scenario)  # warm the style and chart caches
+    return lambda: reports.build_pdf(scenario)
+
+
+# ---------- full-page reruns ----------
+def _app_rerun(script):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(ROOT / script), default_timeout=60)
+    return app.run
+
+
+@case("app.rerun.app7")
+def _():
+    return _app_rerun("app7.0.py")
+
+
+@case("app.rerun.ey1")
+def _():
+    return _app_rerun("EY1.0.py")
+
+
+def run_case(name):
+    setup, number = CASES[name]
+    fn = setup()
+    fn()  # warm-up
+    per_call = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call.append((time.perf_counter() - start) / number * 1e6)
+    return {"median_us": statistics.median(per_call), "min_us": min(per_call)}
+
+
+def environment():
+    import streamlit
+
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "streamlit": streamlit.__version__,
+        "machine": platform.machine(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--update", action="store_true", help="rewrite baseline.json with these results")
+    parser.add_argument("-k", dest="pattern", default="", help="only run cases whose name contains this")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in CASES:
+        if args.pattern in name:
+            results[name] = run_case(name)
+            print(f"{name:<36} {results[name]['median_us']:>14,.1f} us")
+
+    if args.update:
+        baseline = json.loads(BASELINE.read_text(encoding="utf-8")) if BASELINE.exists() else {"cases": {}}
+        baseline["environment"] = environment()
+        baseline["cases"].update(results)
+        BASELINE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"baseline written to {BASELINE.name}")
+        return 0
+
+    baseline = json.loads(BASELINE.read_text(encoding="utf-8"))["cases"]
+    failures = []
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name}: no baseline, run with --update")
+            continue
+        reference_us = baseline[name]["median_us"]
+        if result["median_us"] > reference_us * TOLERANCE and result["median_us"] - reference_us > NOISE_FLOOR_US:
+            failures.append(f"{name}: {result['median_us']:,.1f} us vs baseline {reference_us:,.1f} us")
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""Headless calculation engines shared by the Streamlit apps."""
+
+from .tariff import TariffEngine
+
+__all__ = ["TariffEngine"]
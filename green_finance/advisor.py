@@ -0,0 +1,246 @@
+"""Cached, coalesced and streamed answers for the AI Green Advisor.
+
+Questions that miss the rule layer go to the OpenAI chat completions API.
+Answers are cached on the normalized question (LRU with a TTL, optionally
+persisted to a JSON file that is replaced atomically and ignored when
+unreadable), and concurrent identical questions share one
+upstream request: the first asker starts a background stream and every
+asker, including the first, reads tokens from it as they arrive.
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+MODEL = "gpt-3.5-turbo"  # works with all API keys
+SYSTEM_PROMPT = "You are a helpful assistant."
+TEMPERATURE = 0.7
+MAX_TOKENS = 300
+
+CACHE_MAX_ENTRIES = 512
+CACHE_TTL_SECONDS = 24 * 3600
+UPSTREAM_WORKERS = 8
+LATENCY_SAMPLES = 1000
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_question(question):
+    """Cache key for a question: lower case, single spaces, no trailing punctuation."""
+    return re.sub(r"\s+", " ", question.lower()).strip().rstrip("?!. ")
+
+
+class AnswerCache:
+    """Thread-safe LRU of answers with a TTL, optionally backed by a JSON file."""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self._entries = OrderedDict()  # key -> (stored_at, answer)
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    for key, (stored_at, answer) in json.load(f).items():
+                        self._entries[key] = (float(stored_at), str(answer))
+            except (OSError, ValueError, TypeError, AttributeError) as e:
+                # A corrupt cache only costs upstream requests; it is rewritten on the next answer
+                self._entries.clear()
+                logger.warning("ignoring unreadable advisor cache %s: %s", path, e)
+            self._evict(time.time())
+
+    def _evict(self, now):
+        for key in [key for key, (stored_at, _) in self._entries.items() if now - stored_at > self.ttl]:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, answer):
+        with self._lock:
+            now = time.time()
+            self._entries[key] = (now, answer)
+            self._entries.move_to_end(key)
+            self._evict(now)
+            if self.path:
+                self._save()
+
+    def _save(self):
+        # A private temporary file per write, so processes saving at once never share one
+        directory = os.path.dirname(os.path.abspath(self.path))
+        f = tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, prefix=".advisor-cache-",
+                                        suffix=".tmp", delete=False)
+        try:
+            with f:
+                json.dump(self._entries, f)
+            os.replace(f.name, self.path)
+        except BaseException:
+            os.unlink(f.name)
+            raise
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _Inflight:
+    """One upstream stream, shared by every asker of the same question."""
+
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.cond = threading.Condition()
+
+    def append(self, chunk):
+        with self.cond:
+            self.chunks.append(chunk)
+            self.cond.notify_all()
+
+    def finish(self, error=None):
+        with self.cond:
+            self.done = True
+            self.error = error
+            self.cond.notify_all()
+
+    def __iter__(self):
+        read = 0
+        while True:
+            with self.cond:
+                while read == len(self.chunks) and not self.done:
+                    self.cond.wait()
+                pending = self.chunks[read:]
+                read = len(self.chunks)
+                done, error = self.done, self.error
+            yield from pending
+            if done and read == len(self.chunks):
+                if error is not None:
+                    raise error
+                return
+
+
+class GreenAdvisor:
+    """Streams advisor answers through the cache and the coalescing layer.
+
+    ``base_url`` points the client at another OpenAI-compatible endpoint,
+    such as the stub server in ``benchmarks/stub_openai.py``.
+    """
+
+    def __init__(self, cache=None, base_url=None, model=MODEL):
+        self.cache = cache if cache is not None else AnswerCache()
+        self.base_url = base_url
+        self.model = model
+        self._inflight = {}
+        self._clients = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=UPSTREAM_WORKERS, thread_name_prefix="advisor")
+        self._counters = {"requests": 0, "hits": 0, "coalesced": 0, "upstream": 0, "errors": 0}
+        self._latencies = []
+
+    def _client(self, api_key):
+        with self._lock:
+            client = self._clients.get(api_key)
+            if client is None:
+                from openai import OpenAI
+
+                # One client per key keeps its HTTP connections alive across questions
+                client = OpenAI(api_key=api_key, base_url=self.base_url)
+                self._clients[api_key] = client
+            return client
+
+    def _fetch(self, key, question, api_key, inflight):
+        try:
+            stream = self._client(api_key).chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": question}
+                ],
+                temperature=TEMPERATURE,
+                max_tokens=MAX_TOKENS,
+                stream=True,
+            )
+            for event in stream:
+                if event.choices and event.choices[0].delta.content:
+                    inflight.append(event.choices[0].delta.content)
+        except Exception as e:
+            with self._lock:
+                self._counters["errors"] += 1
+            inflight.finish(e)
+        else:
+            self.cache.put(key, "".join(inflight.chunks))
+            inflight.finish()
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def ask(self, question, api_key):
+        """Yield the answer to ``question`` chunk by chunk.
+
+        Cache hits yield the whole answer at once.  Upstream errors are
+        re-raised to every asker of the question and nothing is cached.
+        """
+        key = normalize_question(question)
+        started = time.perf_counter()
+        with self._lock:
+            self._counters["requests"] += 1
+        answer = self.cache.get(key)
+        if answer is not None:
+            with self._lock:
+                self._counters["hits"] += 1
+            self._record(started)
+            yield answer
+            return
+
+        with self._lock:
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                inflight = self._inflight[key] = _Inflight()
+                self._counters["upstream"] += 1
+                self._executor.submit(self._fetch, key, question, api_key, inflight)
+            else:
+                self._counters["coalesced"] += 1
+        yield from inflight
+        self._record(started)
+
+    def _record(self, started):
+        with self._lock:
+            self._latencies.append(time.perf_counter() - started)
+            del self._latencies[:-LATENCY_SAMPLES]
+
+    def stats(self):
+        """Request counters, cache hit rate and answer latency percentiles."""
+        import numpy as np
+
+        with self._lock:
+            stats = dict(self._counters)
+            latencies = np.array(self._latencies)
+        stats["hit_rate"] = stats["hits"] / stats["requests"] if stats["requests"] else 0.0
+        stats["cached_answers"] = len(self.cache)
+        if len(latencies):
+            stats["latency_p50_ms"] = float(np.percentile(latencies, 50) * 1000)
+            stats["latency_p99_ms"] = float(np.percentile(latencies, 99) * 1000)
+        return stats
+
+
+@lru_cache(maxsize=None)
+def get_advisor(base_url=None, cache_path=None):
+    """Process-wide advisor, shared by every session."""
+    return GreenAdvisor(cache=AnswerCache(path=cache_path), base_url=base_url)
@@ -0,0 +1,266 @@
+"""Local HTTP JSON API for the ROI calculator, without Streamlit.
+
+Every endpoint takes a JSON object by ``POST`` and runs the same vectorized
+engine as the apps, so each field may be a number or a list (lists
+broadcast against scalars and are answered element by element):
+
+    POST /tariff/bill       {"kwh"}                                   -> {"bill"}
+    POST /tariff/kwh        {"bill"}                                  -> {"kwh"}
+    POST /solar/size        {"monthly_bill", "house_type"}            -> {"system_size_kw", "monthly_savings", "matched"}
+    POST /water/savings     {"monthly_bill"} or {"monthly_usage", "state"}, optional "efficiency"
+                                                                      -> {"monthly_bill", "monthly_savings"}
+    POST /roi               {"investment", "monthly_savings", "years"} -> {"total_savings", "roi", "payback_months", "payback_years"}
+    POST /scenario          one scenario in ``evaluate_portfolio`` columns -> its results
+    POST /scenarios         {"scenarios": [scenario, ...]}            -> {"results": [result, ...]}
+                            or {"columns": {name: [...]}}             -> {"columns": {name: [...]}}
+    GET  /health            -> {"status", "reference_version"}
+
+Unbounded values (payback with no savings) and unknown lookups come back
+as ``null``.  Bad input gets a 400 with ``{"error"}``; that includes
+``null`` or non-finite numbers, except in ``/scenario`` and ``/scenarios``,
+where ``null`` is a blank cell.
+
+The server is the standard library's threading HTTP server speaking
+HTTP/1.1, so clients can keep connections alive between requests.
+Responses are encoded with orjson when it is installed (NumPy arrays go
+straight to JSON), falling back to ``json``.
+
+Run beside the app:
+
+    python -m green_finance.api --port 8502
+"""
+
+import argparse
+import json
+import math
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from . import reference
+from . import roi as roi_engine
+from .bulk import TEXT_COLUMNS, check_columns
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8502
+MAX_BODY_BYTES = 32 * 1024 * 1024
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _plain(value):
+    # Python scalars and lists with non-finite floats as None
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    elif isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    return value
+
+
+def dumps(payload):
+    """JSON bytes for a dict that may hold NumPy scalars and arrays."""
+    if orjson is not None:
+        # orjson writes NaN and inf as null itself
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(_plain(payload), separators=(",", ":")).encode("utf-8")
+
+
+def loads(body):
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+def _numbers(payload, *names):
+    values = []
+    for name in names:
+        if name not in payload:
+            raise ValueError(f"missing field(s): {name}")
+        value = np.asarray(payload[name], dtype=float)
+        if not np.isfinite(value).all():
+            raise ValueError(f"{name} must be finite numbers")
+        values.append(value)
+    return np.broadcast_arrays(*values)
+
+
+def _output(value, shape):
+    # Answer scalars with scalars and lists with lists; orjson only takes C-contiguous arrays,
+    # and a result broadcast from a scalar input is a strided view
+    value = np.asarray(value)
+    return value.item() if shape == () else np.ascontiguousarray(value)
+
+
+def tariff_bill(payload):
+    (kwh,) = _numbers(payload, "kwh")
+    return {"bill": _output(reference.current().tariff_engine.bill_from_kwh(kwh), kwh.shape)}
+
+
+def tariff_kwh(payload):
+    (bill,) = _numbers(payload, "bill")
+    return {"kwh": _output(reference.current().tariff_engine.kwh_from_bill(bill), bill.shape)}
+
+
+def solar_size(payload):
+    (bill,) = _numbers(payload, "monthly_bill")
+    bill, house_type = np.broadcast_arrays(bill, np.asarray(payload.get("house_type", ""), dtype=str))
+    size, savings, matched = roi_engine.size_solar_from_bill(bill, house_type)
+    return {
+        "system_size_kw": _output(size, bill.shape),
+        "monthly_savings": _output(savings, bill.shape),
+        "matched": _output(matched, bill.shape),
+    }
+
+
+def water_savings(payload):
+    payload = {"efficiency": roi_engine.DEFAULT_WATER_EFFICIENCY, **payload}
+    if "monthly_bill" in payload:
+        bill, efficiency = _numbers(payload, "monthly_bill", "efficiency")
+    else:
+        usage, efficiency = _numbers(payload, "monthly_usage", "efficiency")
+        usage, state = np.broadcast_arrays(usage, np.asarray(payload.get("state", ""), dtype=str))
+        bill = roi_engine.water_bill(usage, state)
+    return {
+        "monthly_bill": _output(bill, bill.shape),
+        "monthly_savings": _output(roi_engine.water_savings(bill, efficiency), bill.shape),
+    }
+
+
+def roi(payload):
+    investment, monthly_savings, years = _numbers(payload, "investment", "monthly_savings", "years")
+    metrics = roi_engine.roi_metrics(investment, monthly_savings, years)
+    return {name: _output(values, investment.shape) for name, values in metrics.items()}
+
+
+def _columns(scenarios):
+    if not scenarios:
+        raise ValueError("no scenarios given")
+    names = set().union(*scenarios)
+    return {name: [scenario.get(name) for scenario in scenarios] for name in names}
+
+
+def _evaluate(columns):
+    check_columns(columns)
+    n = len(columns["category"])
+    arrays = {}
+    for name, values in columns.items():
+        if len(values) != n:
+            raise ValueError(f"column {name} has {len(values)} values, expected {n}")
+        # JSON null is a blank: empty text or a missing number
+        if name in TEXT_COLUMNS:
+            arrays[name] = np.array(["" if value is None else value for value in values], dtype=str)
+        else:
+            arrays[name] = np.array([np.nan if value is None else value for value in values], dtype=float)
+    return roi_engine.evaluate_portfolio(arrays)
+
+
+def scenario(payload):
+    result = _evaluate({name: [value] for name, value in payload.items()})
+    return {name: values[0] for name, values in result.items()}
+
+
+def scenarios(payload):
+    if "columns" in payload:
+        # Columns in, columns out: the arrays go to the encoder as they are
+        return {"columns": _evaluate(payload["columns"])}
+    result = _evaluate(_columns(payload.get("scenarios", [])))
+    names = list(result)
+    rows = zip(*(_plain(result[name]) for name in names))
+    return {"results": [dict(zip(names, row)) for row in rows]}
+
+
+def health(payload=None):
+    return {"status": "ok", "reference_version": reference.current().version}
+
+
+ROUTES = {
+    ("GET", "/health"): health,
+    ("POST", "/tariff/bill"): tariff_bill,
+    ("POST", "/tariff/kwh"): tariff_kwh,
+    ("POST", "/solar/size"): solar_size,
+    ("POST", "/water/savings"): water_savings,
+    ("POST", "/roi"): roi,
+    ("POST", "/scenario"): scenario,
+    ("POST", "/scenarios"): scenarios,
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    server_version = "GreenFinanceAPI/1"
+    # Headers and body leave in one segment, without waiting on Nagle/delayed ACK
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def _send(self, status, payload):
+        body = dumps(payload)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, method):
+        route = ROUTES.get((method, self.path.split("?", 1)[0].rstrip("/") or "/"))
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length < 0:
+                raise ValueError
+        except ValueError:
+            # Where the body ends is unknown, so the connection cannot be reused
+            self.close_connection = True
+            return self._send(400, {"error": "invalid Content-Length"})
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            return self._send(413, {"error": f"body larger than {MAX_BODY_BYTES} bytes"})
+        body = self.rfile.read(length) if length else b""
+        if route is None:
+            return self._send(404, {"error": f"no endpoint {method} {self.path}"})
+        try:
+            payload = loads(body) if body else {}
+            if not isinstance(payload, dict):
+                raise ValueError("request body must be a JSON object")
+            self._send(200, route(payload))
+        except (ValueError, TypeError, KeyError) as exc:
+            self._send(400, {"error": str(exc)})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def log_message(self, format, *args):
+        pass  # one line per request would dominate small-request throughput
+
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """A ready ``ThreadingHTTPServer``; call ``serve_forever()`` on it."""
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+    server = make_server(args.host, args.port)
+    print(f"Serving the ROI API on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
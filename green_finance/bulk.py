@@ -0,0 +1,89 @@
+"""Bulk scoring of uploaded customer lists.
+
+The CSV is read ``CHUNK_ROWS`` rows at a time with pandas, each chunk is
+scored by ``roi.evaluate_portfolio`` in one vectorized pass and written
+straight to the output stream, so memory depends on the chunk size and
+not on the length of the file.
+
+Columns follow ``evaluate_portfolio``: ``state``, ``category``,
+``investment``, ``years`` and ``monthly_bill`` and/or
+``monthly_consumption``, plus the optional ``house_type`` (blank takes the
+default house type), ``efficiency`` and ``monthly_savings``.  Scored rows keep their input columns, with
+``monthly_bill`` and ``monthly_savings`` filled in where they were blank,
+and results rounded to ``ROUND_DECIMALS`` (sen) to keep the output small.
+Each chunk also gets a ``predicted_roi`` column from the trained model
+(a surrogate of the engine, see ``green_finance.prediction``), scored in
+one batch.
+"""
+
+import numpy as np
+
+from .prediction import predict_roi
+from .roi import evaluate_portfolio
+
+CHUNK_ROWS = 50_000
+ROUND_DECIMALS = 2
+REQUIRED_COLUMNS = ("state", "category", "investment", "years")
+USAGE_COLUMNS = ("monthly_bill", "monthly_consumption")
+TEXT_COLUMNS = ("state", "category", "house_type")
+
+
+def check_columns(columns):
+    """Raise ``ValueError`` naming any required column that is missing."""
+    missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+    if not any(name in columns for name in USAGE_COLUMNS):
+        missing.append(" or ".join(USAGE_COLUMNS))
+    if missing:
+        raise ValueError(f"missing column(s): {', '.join(missing)}")
+
+
+def _read_csv(source, **kwargs):
+    import pandas as pd
+
+    return pd.read_csv(source, dtype={name: str for name in TEXT_COLUMNS}, skipinitialspace=True, **kwargs)
+
+
+def frame_columns(frame):
+    """Validated ``evaluate_portfolio`` columns of a DataFrame."""
+    check_columns(frame.columns)
+    # Fixed-width strings keep the state and house lookups off object compares
+    return {
+        name: frame[name].fillna("").to_numpy(dtype=str) if name in TEXT_COLUMNS else frame[name].to_numpy()
+        for name in frame.columns
+    }
+
+
+def read_columns(source):
+    """A whole (small) CSV as ``evaluate_portfolio`` columns."""
+    return frame_columns(_read_csv(source))
+
+
+def iter_scored_chunks(source, chunk_rows=CHUNK_ROWS):
+    """Yield scored DataFrames for consecutive chunks of a CSV.
+
+    Raises ``ValueError`` when a required column is missing.
+    """
+    with _read_csv(source, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            columns = frame_columns(chunk)
+            result = evaluate_portfolio(columns)
+            # Keep what the customer gave us; only fill in the blanks
+            for name in result.keys() & columns.keys():
+                result[name] = np.where(np.isnan(columns[name]), result[name], columns[name])
+            result["predicted_roi"] = predict_roi(dict(columns, monthly_bill=result["monthly_bill"]))
+            yield chunk.assign(**{name: np.round(values, ROUND_DECIMALS) for name, values in result.items()})
+
+
+def score_csv(source, out, chunk_rows=CHUNK_ROWS, progress=None):
+    """Score ``source`` chunk by chunk into the text stream ``out``.
+
+    ``progress(rows_done)`` is called after each chunk.  Returns the number
+    of rows scored.
+    """
+    rows = 0
+    for scored in iter_scored_chunks(source, chunk_rows):
+        scored.to_csv(out, header=rows == 0, index=False)
+        rows += len(scored)
+        if progress is not None:
+            progress(rows)
+    return rows
@@ -0,0 +1,143 @@
+"""Discounted cash-flow metrics for batches of scenarios.
+
+Monthly savings grow with tariff escalation and shrink with panel
+degradation, both stepped once a year, and stop at each scenario's
+horizon.  Cash flows are built as a ``(scenarios, months)`` matrix a chunk
+of scenarios at a time, so NPV and discounted payback are a matrix-vector
+product and a cumulative sum.
+
+IRR is solved for all scenarios at once: a safeguarded Newton iteration
+on the monthly rate, falling back to bisection whenever a Newton step
+leaves the bracket.  Rows drop out of the iteration as they converge.
+Rates in and out are annual.
+"""
+
+import numpy as np
+
+DEFAULT_DISCOUNT_RATE = 0.05
+DEFAULT_ESCALATION = 0.0
+DEFAULT_DEGRADATION = 0.0
+SOLAR_DEGRADATION = 0.005  # typical panel output loss per year
+DEFAULT_CHUNK = 16_384
+IRR_BRACKET = (-0.99, 10.0)  # annual rates
+IRR_TOLERANCE = 1e-10
+IRR_MAX_ITER = 100
+
+
+def _monthly_rate(annual_rate):
+    return np.power(1 + np.asarray(annual_rate, dtype=float), 1 / 12) - 1
+
+
+def yearly_levels(monthly_savings, years, escalation=DEFAULT_ESCALATION, degradation=DEFAULT_DEGRADATION):
+    """Monthly savings in each year, shape ``(n, max(years))``; zero past each horizon."""
+    monthly_savings, years, escalation, degradation = (
+        np.atleast_1d(np.asarray(value, dtype=float))
+        for value in np.broadcast_arrays(monthly_savings, years, escalation, degradation)
+    )
+    year = np.arange(int(np.nanmax(years, initial=0)))
+    levels = monthly_savings[:, None] * np.power(((1 + escalation) * (1 - degradation))[:, None], year)
+    levels[year >= years[:, None]] = 0
+    return levels
+
+
+def cash_flows(monthly_savings, years, escalation=DEFAULT_ESCALATION, degradation=DEFAULT_DEGRADATION):
+    """Savings matrix of shape ``(n, 12 * max(years))``; zero past each horizon."""
+    return np.repeat(yearly_levels(monthly_savings, years, escalation, degradation), 12, axis=1)
+
+
+def _present_value(levels, log_rate):
+    # PV of yearly-stepped monthly flows at monthly rate exp(log_rate) - 1, and
+    # its derivative in log_rate; each year is one 12-month annuity
+    month = np.arange(1, 13)
+    within = np.exp(-log_rate[:, None] * month)
+    annuity, weighted = within.sum(axis=1), (within * month).sum(axis=1)
+    offset = 12 * np.arange(levels.shape[1])
+    yearly = levels * np.exp(-log_rate[:, None] * offset)
+    value = yearly.sum(axis=1) * annuity
+    slope = -(yearly * offset).sum(axis=1) * annuity - yearly.sum(axis=1) * weighted
+    return value, slope
+
+
+def irr(investment, levels):
+    """Annual IRR of ``-investment`` now against ``yearly_levels`` savings.
+
+    NaN where the savings are never worth the investment within
+    ``IRR_BRACKET`` (or there is no investment).  Newton steps are taken on
+    the log of the monthly growth factor, where present value is convex.
+    """
+    investment = np.atleast_1d(np.asarray(investment, dtype=float))
+    n = len(levels)
+    low = np.full(n, np.log1p(IRR_BRACKET[0]) / 12)
+    high = np.full(n, np.log1p(IRR_BRACKET[1]) / 12)
+    # Present value falls as the rate rises, so a root exists only if the bracket straddles the investment
+    valid = (
+        (investment > 0)
+        & (_present_value(levels, low)[0] >= investment)
+        & (_present_value(levels, high)[0] <= investment)
+    )
+    # Start from the rate that turns the undiscounted total into the investment over the mean horizon
+    with np.errstate(divide="ignore", invalid="ignore"):
+        months = np.maximum((levels > 0).sum(axis=1), 1) * 12
+        guess = np.log(levels.sum(axis=1) * 12 / investment) / (months / 2)
+    log_rate = np.clip(np.where(valid, guess, np.nan), low, high)
+
+    active = np.flatnonzero(valid)
+    for _ in range(IRR_MAX_ITER):
+        if not len(active):
+            break
+        value, slope = _present_value(levels[active], log_rate[active])
+        f = value - investment[active]
+        done = np.abs(f) <= IRR_TOLERANCE * investment[active]
+        # f > 0 means the rate is still too low
+        low[active] = np.where(f > 0, log_rate[active], low[active])
+        high[active] = np.where(f > 0, high[active], log_rate[active])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = log_rate[active] - f / slope
+        inside = np.isfinite(newton) & (newton > low[active]) & (newton < high[active])
+        log_rate[active] = np.where(done, log_rate[active], np.where(inside, newton, (low[active] + high[active]) / 2))
+        active = active[~done & (high[active] - low[active] > 1e-15)]
+    return np.where(valid, np.expm1(12 * log_rate), np.nan)
+
+
+def evaluate(investment, monthly_savings, years, discount_rate=DEFAULT_DISCOUNT_RATE,
+             escalation=DEFAULT_ESCALATION, degradation=DEFAULT_DEGRADATION, chunk_size=DEFAULT_CHUNK):
+    """NPV, IRR and discounted payback for a batch of scenarios.
+
+    Every argument may be a scalar or an array; they broadcast to ``(n,)``.
+    Returns a dict of ``(n,)`` arrays: ``total_savings`` (undiscounted, with
+    escalation and degradation), ``npv``, ``irr`` (annual, NaN when the
+    savings never repay the investment) and ``discounted_payback_months``
+    (``inf`` when not reached within the horizon).  Rows with a non-finite
+    input or a horizon under one year are NaN throughout.
+    """
+    investment, monthly_savings, years, discount_rate, escalation, degradation = inputs = [
+        np.atleast_1d(np.asarray(value, dtype=float))
+        for value in np.broadcast_arrays(investment, monthly_savings, years, discount_rate, escalation, degradation)
+    ]
+    n = len(investment)
+    result = {name: np.full(n, np.nan) for name in ("total_savings", "npv", "irr", "discounted_payback_months")}
+    valid = np.flatnonzero(np.logical_and.reduce([np.isfinite(values) for values in inputs]) & (years >= 1))
+    for start in range(0, len(valid), chunk_size):
+        rows = valid[start:start + chunk_size]
+        levels = yearly_levels(monthly_savings[rows], years[rows], escalation[rows], degradation[rows])
+        flows = np.repeat(levels, 12, axis=1)
+        t = np.arange(1, flows.shape[1] + 1, dtype=float)
+        discounted = flows * np.exp(-np.log1p(_monthly_rate(discount_rate[rows]))[:, None] * t)
+        cumulative = np.cumsum(discounted, axis=1)
+        repaid = cumulative >= investment[rows, None]
+        result["total_savings"][rows] = flows.sum(axis=1)
+        result["npv"][rows] = cumulative[:, -1] - investment[rows]
+        result["discounted_payback_months"][rows] = np.where(repaid.any(axis=1), repaid.argmax(axis=1) + 1, np.inf)
+        result["irr"][rows] = irr(investment[rows], levels)
+    return result
+
+
+def npv(investment, monthly_savings, years, discount_rate=DEFAULT_DISCOUNT_RATE):
+    """NPV of flat monthly savings, in closed form (annuity factor)."""
+    investment = np.asarray(investment, dtype=float)
+    monthly_savings = np.asarray(monthly_savings, dtype=float)
+    months = np.asarray(years, dtype=float) * 12
+    rate = _monthly_rate(discount_rate)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = np.where(rate == 0, months, (1 - (1 + rate) ** -months) / rate)
+    return monthly_savings * annuity - investment
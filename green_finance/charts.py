@@ -0,0 +1,174 @@
+"""ROI charts rendered to PNG bytes.
+
+Figures are built on a bare ``matplotlib.figure.Figure`` rather than
+``pyplot``, so they are never registered with the global figure manager and
+are released as soon as the bytes are written.  Rendered PNGs are kept in a
+bounded LRU keyed on the chart inputs and the loaded reference data's
+mtime, so a reference update redraws them; the on-screen view and the PDF
+export reuse the same bytes.
+"""
+
+import functools
+from functools import lru_cache
+from io import BytesIO
+
+import numpy as np
+
+from . import montecarlo, reference
+from . import roi as roi_engine
+from . import scenario_cache
+from . import sensitivity
+
+CHART_CACHE_SIZE = 128
+FIGSIZE = (6, 4)
+DPI = 100
+
+CUMULATIVE_SAVINGS = "Cumulative Savings Over Time"
+INVESTMENT_VS_SAVINGS = "Investment vs. Total Savings"
+SAVINGS_BANDS = "Simulated Savings Range (P10-P90)"
+STATE_COMPARISON_FIGSIZE = (7, 6)
+
+
+def _chart_cache(fn):
+    """``lru_cache`` on the chart inputs plus the reference data mtime."""
+    @lru_cache(maxsize=CHART_CACHE_SIZE)
+    def cached(reference_mtime, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return cached(reference.current().mtime, *args, **kwargs)
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
+def _render(draw, figsize=FIGSIZE):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize, dpi=DPI)
+    FigureCanvasAgg(fig)
+    try:
+        draw(fig.add_subplot())
+        buffer = BytesIO()
+        fig.savefig(buffer, format="png")
+        return buffer.getvalue()
+    finally:
+        fig.clear()
+
+
+@_chart_cache
+def cumulative_savings_png(state, category, investment, monthly_savings, years):
+    """Cumulative savings path against the investment, with the payback line."""
+    months, savings = roi_engine.cumulative_savings(monthly_savings, years)
+    payback_months = float(roi_engine.roi_metrics(investment, monthly_savings, years)["payback_months"])
+
+    def draw(ax):
+        ax.plot(months, savings, label="Cumulative Savings")
+        ax.axhline(y=investment, linestyle="--", label="Initial Investment")
+        if monthly_savings > 0 and payback_months <= years * 12:
+            ax.axvline(x=payback_months, linestyle="--", label="Payback Period")
+        ax.set_xlabel("Months")
+        ax.set_ylabel("RM")
+        ax.set_title(f"Monthly Cumulative Savings in {state} for {category}")
+        ax.legend()
+
+    return _render(draw)
+
+
+@_chart_cache
+def investment_vs_savings_png(state, category, investment, total_savings, years):
+    """Bar chart of the initial investment next to total savings."""
+    def draw(ax):
+        ax.bar(["Initial Investment", f"Savings ({years} yrs)"], [investment, total_savings])
+        ax.set_ylabel("RM")
+        ax.set_title(f"Investment vs. Total Savings in {state} for {category}")
+
+    return _render(draw)
+
+
+@_chart_cache
+def savings_bands_png(state, category, investment, monthly_savings, years, n_paths):
+    """P10/P50/P90 cumulative savings from the Monte Carlo simulation."""
+    simulation = montecarlo.cached_simulation(monthly_savings, years, investment, n_paths)
+    months = simulation["months"]
+
+    def draw(ax):
+        ax.fill_between(months, simulation["p10"], simulation["p90"], alpha=0.3, label="P10-P90")
+        ax.plot(months, simulation["p50"], label="Median (P50)")
+        ax.axhline(y=investment, linestyle="--", label="Initial Investment")
+        ax.set_xlabel("Months")
+        ax.set_ylabel("RM")
+        ax.set_title(f"Simulated Cumulative Savings in {state} for {category}")
+        ax.legend()
+
+    return _render(draw)
+
+
+@_chart_cache
+def roi_heatmap_png(investment_range, savings_range, steps, years, metric="roi"):
+    """Heatmap of ROI (%) or payback (months) over investment x monthly savings."""
+    investment, monthly_savings = sensitivity.grid_axes(investment_range, savings_range, steps)
+    grid = sensitivity.roi_grid(investment, monthly_savings, [years])
+    if metric == "roi":
+        values, label = grid["roi"][:, :, 0], "ROI (%)"
+    else:
+        values, label = grid["payback_months"], "Payback (months)"
+
+    def draw(ax):
+        from matplotlib.colors import Normalize, TwoSlopeNorm
+
+        # Clip the long tail so the break-even region stays readable
+        upper = float(np.percentile(values[np.isfinite(values)], 95))
+        if metric == "roi":
+            norm, cmap = TwoSlopeNorm(vcenter=0, vmin=-100, vmax=max(upper, 1)), "RdYlGn"
+        else:
+            norm, cmap = Normalize(vmin=0, vmax=upper), "RdYlGn_r"
+        image = ax.imshow(
+            values, origin="lower", aspect="auto", cmap=cmap, norm=norm,
+            extent=[savings_range[0], savings_range[1], investment_range[0], investment_range[1]],
+        )
+        ax.figure.colorbar(image, ax=ax, label=label)
+        ax.set_xlabel("Monthly Savings (RM)")
+        ax.set_ylabel("Initial Investment (RM)")
+        ax.set_title(f"{label} over {years} years" if metric == "roi" else label)
+
+    return _render(draw)
+
+
+def chart_cache_info():
+    """Hit/miss counters of the chart caches, for diagnostics."""
+    return {
+        CUMULATIVE_SAVINGS: cumulative_savings_png.cache_info(),
+        INVESTMENT_VS_SAVINGS: investment_vs_savings_png.cache_info(),
+        SAVINGS_BANDS: savings_bands_png.cache_info(),
+        "ROI Heatmap": roi_heatmap_png.cache_info(),
+        "ROI by State": state_comparison_png.cache_info(),
+    }
+
+
+@_chart_cache
+def state_comparison_png(investment, years, monthly_kwh, monthly_water_m3, house_type,
+                         efficiency=roi_engine.DEFAULT_WATER_EFFICIENCY):
+    """ROI of every state side by side for Solar and Water, best state on top."""
+    table = scenario_cache.state_comparison(investment, years, monthly_kwh, monthly_water_m3, house_type, efficiency)
+    # States in order of their best row in the ranking
+    _, first = np.unique(table["state"], return_index=True)
+    states = table["state"][np.sort(first)][::-1]
+    position = {state: i for i, state in enumerate(states)}
+    height = 0.4
+
+    def draw(ax):
+        for offset, category in ((height / 2, roi_engine.SOLAR), (-height / 2, roi_engine.WATER)):
+            rows = table["category"] == category
+            y = np.array([position[state] for state in table["state"][rows]]) + offset
+            ax.barh(y, table["roi"][rows], height=height, label=category)
+        ax.axvline(x=0, color="black", linewidth=0.8)
+        ax.set_yticks(np.arange(len(states)), states)
+        ax.set_xlabel(f"ROI over {years} years (%)")
+        ax.set_title("ROI by State")
+        ax.legend(loc="upper center", bbox_to_anchor=(0.5, -0.1), ncol=2)
+        ax.figure.subplots_adjust(left=0.25, bottom=0.2)
+
+    return _render(draw, STATE_COMPARISON_FIGSIZE)
@@ -0,0 +1,57 @@
+"""Every state and both categories for one set of inputs, in one pass.
+
+The single-state page sizes solar from the bill bands, which do not depend
+on the state, so solar savings here come from the hourly net-metering
+engine instead: one ``solar.simulate`` call over all states, each with its
+own yield.  Water savings price the same usage at each state's tariff.
+ROI and payback for every (state, category) row are then one
+``roi_metrics`` call.
+"""
+
+import numpy as np
+
+from . import reference, solar
+from . import roi as roi_engine
+
+COLUMNS = (
+    "rank", "state", "category", "irradiation", "water_tariff",
+    "monthly_bill", "monthly_savings", "total_savings", "roi", "payback_months",
+)
+
+
+def compare_states(investment, years, monthly_kwh, monthly_water_m3, house_type,
+                   efficiency=roi_engine.DEFAULT_WATER_EFFICIENCY):
+    """Ranked comparison columns (see ``COLUMNS``), best ROI first.
+
+    ``monthly_kwh`` is the electricity use behind the solar rows and
+    ``monthly_water_m3`` the water use behind the water rows.
+    """
+    data = reference.current()
+    states = np.array(list(data.solar_data))
+    n = len(states)
+
+    system_kw, _ = roi_engine.size_solar_from_kwh(monthly_kwh, house_type)
+    hourly = solar.simulate(states, system_kw, monthly_kwh)
+    water_bill = roi_engine.water_bill(np.full(n, monthly_water_m3, dtype=float), states)
+
+    # Solar rows first, then water rows, in the state table's order
+    state = np.concatenate((states, states))
+    category = np.repeat([roi_engine.SOLAR, roi_engine.WATER], n)
+    monthly_bill = np.concatenate((hourly["bill_before"].mean(axis=1), water_bill))
+    monthly_savings = np.concatenate((hourly["monthly_savings"], roi_engine.water_savings(water_bill, efficiency)))
+    metrics = roi_engine.roi_metrics(investment, monthly_savings, years)
+
+    order = np.argsort(-np.nan_to_num(metrics["roi"], nan=-np.inf), kind="stable")
+    columns = {
+        "rank": np.arange(1, len(order) + 1),
+        "state": state[order],
+        "category": category[order],
+        "irradiation": np.array([data.solar_data[name] for name in state])[order],
+        "water_tariff": np.array([data.water_tariffs.get(name, data.default_water_tariff) for name in state])[order],
+        "monthly_bill": monthly_bill[order],
+        "monthly_savings": monthly_savings[order],
+        "total_savings": metrics["total_savings"][order],
+        "roi": metrics["roi"][order],
+        "payback_months": metrics["payback_months"][order],
+    }
+    return columns
@@ -0,0 +1,130 @@
+"""Single-pass export of monthly and yearly savings series.
+
+Series are kept as dicts of NumPy columns and written straight into a byte
+buffer: CSV through the C ``csv`` writer, Parquet and Arrow IPC through
+pyarrow (imported only when those formats are asked for).  The yearly
+rollup is a reshape view of the monthly path, not a groupby.
+"""
+
+import csv
+import io
+
+import numpy as np
+
+from . import roi as roi_engine
+
+# format -> (file extension, MIME type)
+FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Arrow": ("arrow", "application/vnd.apache.arrow.file"),
+}
+DECIMALS = 2
+
+
+def yearly_rollup(savings):
+    """Year-end values of monthly cumulative paths (last axis), as a view."""
+    savings = np.asarray(savings)
+    return savings.reshape(savings.shape[:-1] + (-1, 12))[..., -1]
+
+
+def monthly_columns(months, savings):
+    return {"Month": np.asarray(months), "Cumulative Savings": np.asarray(savings)}
+
+
+def yearly_columns(savings):
+    yearly = yearly_rollup(savings)
+    return {"Year": np.arange(1, len(yearly) + 1), "Yearly Cumulative Savings": yearly}
+
+
+def scenario_columns(scenarios):
+    """Long-form monthly and yearly columns for many scenarios.
+
+    Backs the budget optimizer's portfolio export.  Each scenario is a dict with ``state``, ``category``, ``monthly_savings``
+    and ``years``.  Every chart path uses the same seeded noise, scaled by
+    the monthly savings, so all paths are slices of one unit path times
+    each scenario's savings and the whole table is built without a loop.
+    """
+    scenarios = list(scenarios)
+    monthly_savings = np.array([scenario["monthly_savings"] for scenario in scenarios], dtype=float)
+    n_months = np.array([int(scenario["years"]) * 12 for scenario in scenarios], dtype=np.int64)
+    starts = np.cumsum(n_months) - n_months
+    total = int(n_months.sum())
+    _, unit_path = roi_engine.cumulative_savings(1.0, int(n_months.max(initial=0)) // 12)
+
+    scenario_index = np.repeat(np.arange(1, len(scenarios) + 1), n_months)
+    months = np.arange(total) - np.repeat(starts, n_months) + 1
+    savings = np.repeat(monthly_savings, n_months) * unit_path[months - 1]
+
+    def labels(key, repeats):
+        return np.repeat(np.array([str(scenario[key]) for scenario in scenarios]), repeats)
+
+    n_years = n_months // 12
+    monthly = {
+        "Scenario": scenario_index,
+        "State": labels("state", n_months),
+        "Category": labels("category", n_months),
+        "Month": months,
+        "Cumulative Savings": savings,
+    }
+    year_end = months % 12 == 0
+    yearly = {
+        "Scenario": scenario_index[year_end],
+        "State": labels("state", n_years),
+        "Category": labels("category", n_years),
+        "Year": months[year_end] // 12,
+        "Yearly Cumulative Savings": savings[year_end],
+    }
+    return monthly, yearly
+
+
+def write_csv(columns, buffer, header=True):
+    """Write columns as CSV rows into a binary buffer; ``header=False`` appends to an earlier table."""
+    text = io.TextIOWrapper(buffer, encoding="utf-8", newline="", write_through=True)
+    writer = csv.writer(text)
+    if header:
+        writer.writerow(columns)
+    values = [
+        np.round(column, DECIMALS).tolist() if np.issubdtype(column.dtype, np.floating) else column.tolist()
+        for column in columns.values()
+    ]
+    writer.writerows(zip(*values))
+    text.detach()
+
+
+def _arrow_table(columns):
+    import pyarrow as pa
+
+    return pa.table({name: np.asarray(column) for name, column in columns.items()})
+
+
+def _write_parquet(columns, buffer):
+    import pyarrow.parquet as pq
+
+    pq.write_table(_arrow_table(columns), buffer)
+
+
+def _write_arrow(columns, buffer):
+    import pyarrow as pa
+
+    table = _arrow_table(columns)
+    with pa.ipc.new_file(buffer, table.schema) as writer:
+        writer.write_table(table)
+
+
+_WRITERS = {"CSV": write_csv, "Parquet": _write_parquet, "Arrow": _write_arrow}
+
+
+def to_bytes(columns, fmt):
+    """Serialize a dict of equal-length columns in one of ``FORMATS``."""
+    buffer = io.BytesIO()
+    _WRITERS[fmt](columns, buffer)
+    return buffer.getvalue()
+
+
+def filename(stem, fmt):
+    return f"{stem}.{FORMATS[fmt][0]}"
+
+
+def mime_type(fmt):
+    return FORMATS[fmt][1]
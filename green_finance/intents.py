@@ -0,0 +1,90 @@
+"""Rule-based quick answers for the AI Green Advisor.
+
+Intents are plain data: a name, the keywords or phrases that trigger it,
+the canned answer and a priority (lower wins; ties go to table order).
+``IntentMatcher`` compiles the table into a token index, so matching a
+question costs one dict lookup per word no matter how many intents are
+loaded.  Keywords only match whole words, so "roi" does not fire on
+"android".  A single-word keyword ending in ``*`` matches any word that
+starts with it ("financ*" covers "finance", "financial", "financing"),
+checked once per distinct prefix length.
+"""
+
+import json
+import re
+
+DEFAULT_INTENTS = [
+    {
+        "name": "financing",
+        "keywords": ["loan*", "financ*", "refinanc*", "microfinanc*"],
+        "answer": "GTFS and LCTF offer low-interest green financing for SMEs.",
+        "priority": 0,
+    },
+    {
+        "name": "roi",
+        "keywords": ["roi", "rois", "payback*", "return on investment"],
+        "answer": "Solar ROI typically ranges from 30–80% depending on state irradiation.",
+        "priority": 1,
+    },
+    {
+        "name": "esg",
+        "keywords": ["esg"],
+        "answer": "ESG adoption improves access to capital and brand reputation.",
+        "priority": 2,
+    },
+]
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return _WORD.findall(text.lower())
+
+
+class IntentMatcher:
+    """Multi-keyword matcher over an intent table with word-boundary semantics."""
+
+    def __init__(self, intents=DEFAULT_INTENTS):
+        self.intents = list(intents)
+        # first token -> [(remaining tokens, rank)]; word prefix -> [rank]
+        self._index = {}
+        self._prefixes = {}
+        for order, intent in enumerate(self.intents):
+            rank = (intent.get("priority", 0), order)
+            for keyword in intent["keywords"]:
+                tokens = tokenize(keyword)
+                if len(tokens) == 1 and keyword.rstrip().endswith("*"):
+                    self._prefixes.setdefault(tokens[0], []).append(rank)
+                elif tokens:
+                    self._index.setdefault(tokens[0], []).append((tuple(tokens[1:]), rank))
+        self._prefix_lengths = sorted({len(prefix) for prefix in self._prefixes})
+
+    @classmethod
+    def from_json(cls, path):
+        """Build a matcher from a JSON list of intents."""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def match(self, question):
+        """Highest-priority intent triggered by ``question``, or ``None``."""
+        tokens = tokenize(question)
+        best = None
+        for i, token in enumerate(tokens):
+            for rest, rank in self._index.get(token, ()):
+                if (best is None or rank < best) and tuple(tokens[i + 1:i + 1 + len(rest)]) == rest:
+                    best = rank
+            for length in self._prefix_lengths:
+                if length > len(token):
+                    break
+                for rank in self._prefixes.get(token[:length], ()):
+                    if best is None or rank < best:
+                        best = rank
+        return None if best is None else self.intents[best[1]]
+
+
+_default_matcher = IntentMatcher()
+
+
+def match_intent(question):
+    """Match ``question`` against the built-in intent table."""
+    return _default_matcher.match(question)
@@ -0,0 +1,67 @@
+"""Monte Carlo simulation of cumulative savings.
+
+Each path draws monthly savings as ``monthly_savings`` plus Gaussian noise
+(``SAVINGS_NOISE`` of the mean, as in the single chart path).  Paths are
+generated a block of months at a time with a ``numpy.random.Generator``
+into one reused ``float32`` block (about ``chunk_size`` path-lengths), and
+each block is reduced to its percentiles before the next is drawn; only the
+running cumulative row is carried over.  Peak memory is one block, not the
+whole ``months x paths`` array: about 8 MB for 100k ten-year paths.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .roi import SAVINGS_NOISE
+
+DEFAULT_PATHS = 10_000
+DEFAULT_CHUNK = 16_384
+PERCENTILES = (10, 50, 90)
+SIMULATION_CACHE_SIZE = 32
+
+
+def simulate_savings(monthly_savings, years, investment, n_paths=DEFAULT_PATHS,
+                     noise=SAVINGS_NOISE, seed=None, dtype=np.float32, chunk_size=DEFAULT_CHUNK):
+    """Simulate ``n_paths`` cumulative savings paths in vectorized chunks.
+
+    Returns a dict with ``months``, one cumulative savings curve per entry
+    of ``PERCENTILES`` (keys ``p10``, ``p50``, ``p90``) and
+    ``payback_probability``, the share of paths whose cumulative savings
+    reach ``investment`` within the horizon.
+    """
+    n_months = int(years) * 12
+    rng = np.random.default_rng(seed)
+    sigma = dtype(monthly_savings * noise)
+    mean = dtype(monthly_savings)
+    paid_back = np.zeros(n_paths, dtype=bool)
+    running = np.zeros(n_paths, dtype=dtype)
+    curves = np.empty((len(PERCENTILES), n_months))
+    months_per_chunk = max(1, chunk_size * n_months // max(n_paths, 1))
+    # Month-major so each month's distribution is contiguous for the percentiles
+    buffer = np.empty((min(months_per_chunk, n_months), n_paths), dtype=dtype)
+    for start in range(0, n_months, months_per_chunk):
+        chunk = buffer[:min(months_per_chunk, n_months - start)]
+        rng.standard_normal(chunk.shape, dtype=dtype, out=chunk)
+        chunk *= sigma
+        chunk += mean
+        chunk[0] += running
+        np.cumsum(chunk, axis=0, out=chunk)
+        running[:] = chunk[-1]
+        paid_back |= (chunk >= investment).any(axis=0)
+        curves[:, start:start + len(chunk)] = np.percentile(chunk, PERCENTILES, axis=1)
+
+    result = {"months": np.arange(1, n_months + 1)}
+    for q, curve in zip(PERCENTILES, curves):
+        result[f"p{q}"] = curve
+    result["payback_probability"] = float(paid_back.mean()) if n_paths else float("nan")
+    return result
+
+
+@lru_cache(maxsize=SIMULATION_CACHE_SIZE)
+def cached_simulation(monthly_savings, years, investment, n_paths=DEFAULT_PATHS, seed=0):
+    """Seeded ``simulate_savings`` summary, memoized for reruns and charts.
+
+    Only the percentile curves are kept, so each entry is a few KB.
+    """
+    return simulate_savings(monthly_savings, years, investment, n_paths=n_paths, seed=seed)
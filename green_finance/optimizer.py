@@ -0,0 +1,185 @@
+"""Budget-constrained selection of green projects.
+
+Candidates are scored with ``roi.evaluate_portfolio`` (same columns as a
+bulk upload) and the subset maximizing total savings or NPV within the
+budget is found with a 0/1 knapsack branch and bound.  Items are visited
+in value-per-ringgit order and each node is bounded by the fractional
+(LP) relaxation, computed with a binary search over prefix sums, so a
+bound costs O(log n).
+
+Most instances are solved serially within ``SERIAL_NODES`` nodes.  Larger
+searches are split on the first ``split_depth`` items: every
+include/exclude combination of them is an independent subproblem, solved
+on a process pool with the best solution so far as the shared lower bound.
+The pool starts its workers with ``forkserver`` (``spawn`` where that is
+unavailable): forking the multi-threaded Streamlit server could copy a lock
+some other thread holds into a child that then waits on it forever.  It is
+shut down when the process exits.
+"""
+
+import atexit
+import math
+import multiprocessing
+import os
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from . import cashflow
+from .roi import evaluate_portfolio
+
+SAVINGS = "savings"
+NPV = "npv"
+DEFAULT_DISCOUNT_RATE = cashflow.DEFAULT_DISCOUNT_RATE
+PARALLEL_THRESHOLD = 200
+SERIAL_NODES = 200_000
+MAX_NODES = 2_000_000
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def _branch_and_bound(values, costs, budget, incumbent=0.0, max_nodes=MAX_NODES):
+    """Best subset of items sorted by ratio, if it beats ``incumbent``.
+
+    Returns ``(value, chosen_positions or None, nodes, complete)``.
+    """
+    n = len(values)
+    prefix_cost = [0.0]
+    prefix_value = [0.0]
+    for value, cost in zip(values, costs):
+        prefix_cost.append(prefix_cost[-1] + cost)
+        prefix_value.append(prefix_value[-1] + value)
+
+    def bound(i, value, cost):
+        # Take whole items from i on while they fit, then a fraction of the next
+        limit = budget - cost + prefix_cost[i]
+        j = bisect_right(prefix_cost, limit, lo=i) - 1
+        total = value + prefix_value[j] - prefix_value[i]
+        if j < n:
+            total += values[j] * (limit - prefix_cost[j]) / costs[j]
+        return total
+
+    best, best_mask = incumbent, None
+    nodes = 0
+    stack = [(0, 0.0, 0.0, 0)]
+    while stack:
+        if nodes >= max_nodes:
+            return best, _positions(best_mask), nodes, False
+        i, value, cost, mask = stack.pop()
+        nodes += 1
+        if value > best:
+            best, best_mask = value, mask
+        if i == n or bound(i, value, cost) <= best + 1e-9:
+            continue
+        stack.append((i + 1, value, cost, mask))
+        if cost + costs[i] <= budget:
+            stack.append((i + 1, value + values[i], cost + costs[i], mask | (1 << i)))
+    return best, _positions(best_mask), nodes, True
+
+
+def _positions(mask):
+    if mask is None:
+        return None
+    return [i for i in range(mask.bit_length()) if mask >> i & 1]
+
+
+def _solve_branch(values, costs, budget, fixed_value, incumbent):
+    value, chosen, nodes, complete = _branch_and_bound(values, costs, budget, incumbent - fixed_value)
+    return fixed_value + value, chosen, nodes, complete
+
+
+@lru_cache(maxsize=None)
+def _process_pool(workers):
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(POOL_START_METHOD))
+    atexit.register(pool.shutdown, wait=False, cancel_futures=True)
+    return pool
+
+
+def optimize(candidates, budget, objective=SAVINGS, discount_rate=DEFAULT_DISCOUNT_RATE,
+             workers=None, split_depth=None):
+    """Pick the candidates that maximize ``objective`` within ``budget``.
+
+    ``candidates`` takes the ``evaluate_portfolio`` columns.  Returns a dict
+    with the boolean ``selected`` mask, the totals, the per-candidate
+    ``scores`` and ``stats`` (timings in ms, nodes explored, workers used
+    and whether the search proved optimality).
+    """
+    started = time.perf_counter()
+    scores = evaluate_portfolio(candidates)
+    if objective == NPV:
+        scores["npv"] = cashflow.npv(candidates["investment"], scores["monthly_savings"], candidates["years"], discount_rate)
+        value = scores["npv"]
+    elif objective == SAVINGS:
+        value = scores["total_savings"]
+    else:
+        raise ValueError(f"unknown objective {objective!r}")
+    cost = np.asarray(candidates["investment"], dtype=float)
+    evaluated = time.perf_counter()
+
+    # Only items that add value and fit on their own can be in the answer
+    usable = np.flatnonzero((value > 0) & (cost > 0) & (cost <= budget))
+    order = usable[np.argsort(-(value[usable] / cost[usable]), kind="stable")]
+    values, costs = value[order].tolist(), cost[order].tolist()
+
+    # Greedy by ratio is a feasible solution and the shared lower bound
+    greedy, spent = [], 0.0
+    for position, item_cost in enumerate(costs):
+        if spent + item_cost <= budget:
+            greedy.append(position)
+            spent += item_cost
+    best_value = sum(values[position] for position in greedy)
+    best = greedy
+
+    # Easy instances finish serially; hard ones escalate to the process pool
+    workers = workers or os.cpu_count() or 1
+    parallel = workers > 1 and len(values) >= PARALLEL_THRESHOLD
+    branch_value, chosen, nodes, complete = _branch_and_bound(
+        values, costs, budget, best_value, SERIAL_NODES if parallel else MAX_NODES)
+    if chosen is not None:
+        best_value, best = branch_value, chosen
+    if complete or not parallel:
+        workers = 1
+    else:
+        depth = min(split_depth or math.ceil(math.log2(workers * 4)), len(values))
+        jobs = []
+        for combination in range(1 << depth):
+            fixed = [position for position in range(depth) if combination >> position & 1]
+            fixed_cost = sum(costs[position] for position in fixed)
+            if fixed_cost <= budget:
+                fixed_value = sum(values[position] for position in fixed)
+                jobs.append((fixed, fixed_value, budget - fixed_cost))
+        pool = _process_pool(workers)
+        futures = [
+            (fixed, pool.submit(_solve_branch, values[depth:], costs[depth:], remaining, fixed_value, best_value))
+            for fixed, fixed_value, remaining in jobs
+        ]
+        complete = True
+        for fixed, future in futures:
+            branch_value, chosen, branch_nodes, branch_complete = future.result()
+            nodes += branch_nodes
+            complete &= branch_complete
+            if chosen is not None and branch_value > best_value:
+                best_value, best = branch_value, fixed + [depth + position for position in chosen]
+    solved = time.perf_counter()
+
+    selected = np.zeros(len(cost), dtype=bool)
+    selected[order[best]] = True
+    return {
+        "selected": selected,
+        "total_investment": float(cost[selected].sum()),
+        "total_savings": float(scores["total_savings"][selected].sum()),
+        "objective_value": float(best_value),
+        "scores": scores,
+        "stats": {
+            "candidates": len(cost),
+            "usable": len(values),
+            "nodes": nodes,
+            "workers": workers,
+            "optimal": complete,
+            "evaluate_ms": (evaluated - started) * 1000,
+            "solve_ms": (solved - evaluated) * 1000,
+            "total_ms": (solved - started) * 1000,
+        },
+    }
@@ -0,0 +1,107 @@
+"""ROI prediction model used by the "AI Predicted ROI" hint and bulk scoring.
+
+The model is trained offline by ``green_finance.training`` and saved as a
+versioned joblib artifact, ``roi_model_v<MODEL_VERSION>.joblib`` in
+``MODEL_DIR``.  It is loaded once per process with ``mmap_mode="r"``, so
+the tree arrays stay in the page cache and are shared by every worker
+process on the machine.  The artifact is built ahead of deployment and
+committed with the code; a missing one is an error, never a model trained
+inside a user's request.
+
+The model predicts ``roi_target``, the log of the payback multiple
+``1 + roi / 100``; ``roi_from_target`` turns that back into percent.
+
+The shipped artifact is trained on the default simulated table (see
+``green_finance.training``), so it is a surrogate of this package's own
+engine, not a forecast from observed outcomes: it approximates the
+calculated ROI to within ``holdout_mae`` percentage points on average.
+
+Scenarios are scored in batches from the same columns as
+``roi.evaluate_portfolio``; ``monthly_bill`` must be filled in.
+"""
+
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from . import reference
+from .roi import SOLAR, WATER, fill_house_type
+
+MODEL_VERSION = 3
+MODEL_DIR = os.environ.get("GREEN_FINANCE_MODEL_DIR", os.path.join(os.path.dirname(__file__), "models"))
+MIN_MULTIPLE = 1e-3  # floor for the payback multiple of a scenario with no savings
+FEATURES = ("irradiation", "water_tariff", "is_solar", "house_type", "monthly_bill", "investment", "years")
+
+
+def model_path(version=MODEL_VERSION):
+    return os.path.join(MODEL_DIR, f"roi_model_v{version}.joblib")
+
+
+def roi_target(roi):
+    """Log payback multiple the model is trained on, for ROI in percent."""
+    return np.log(np.maximum(1 + np.asarray(roi, dtype=float) / 100, MIN_MULTIPLE))
+
+
+def roi_from_target(values):
+    return 100 * np.expm1(values)
+
+
+def _map(keys, table, default=np.nan):
+    # Look up each distinct key once, then broadcast back
+    unique, inverse = np.unique(np.asarray(keys, dtype=str), return_inverse=True)
+    return np.array([table.get(key, default) for key in unique], dtype=float)[inverse]
+
+
+def features(scenarios):
+    """``(n, len(FEATURES))`` float matrix for a columnar batch of scenarios."""
+    data = reference.current()
+    columns = [np.atleast_1d(scenarios.get(name, "")) for name in ("category", "state", "house_type", *FEATURES[4:])]
+    n = np.broadcast(*columns).shape[0]
+    category, state, house_type = (np.broadcast_to(column, n) for column in columns[:3])
+    house_codes = {name: code for code, name in enumerate(data.house_types)}
+    is_solar = category == SOLAR
+    X = np.empty((n, len(FEATURES)))
+    X[:, 0] = _map(state, data.solar_data)
+    X[:, 1] = _map(state, data.water_tariffs, data.default_water_tariff)
+    X[:, 2] = np.where(is_solar, 1.0, np.where(category == WATER, 0.0, np.nan))
+    X[:, 3] = np.where(is_solar, _map(fill_house_type(house_type), house_codes), np.nan)
+    for column, values in enumerate(columns[3:], start=4):
+        X[:, column] = np.broadcast_to(values.astype(float), n)
+    return X
+
+
+@lru_cache(maxsize=None)
+def load_roi_model(version=MODEL_VERSION):
+    """Artifact dict (``model``, ``features``, ``metrics``...) for ``version``."""
+    import joblib
+
+    if version != MODEL_VERSION:
+        raise ValueError(f"Unknown ROI model version: {version}")
+    path = model_path(version)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No ROI model at {path}; build it with python -m green_finance.training")
+    artifact = joblib.load(path, mmap_mode="r")
+    if artifact["version"] != version or tuple(artifact["features"]) != FEATURES:
+        raise ValueError(f"ROI model at {path} does not match version {version}; retrain it")
+    return artifact
+
+
+def holdout_mae(version=MODEL_VERSION):
+    """Mean absolute error (percentage points) of the artifact on its hold-out split."""
+    return load_roi_model(version)["metrics"]["test"]["mae"]
+
+
+def predict_roi(scenarios):
+    """Predicted ROI (%) for a columnar batch of scenarios.
+
+    NaN for other categories and, like ``evaluate_portfolio``, for solar
+    scenarios with an unknown house type.
+    """
+    X = features(scenarios)
+    predicted = np.full(len(X), np.nan)
+    known = ~np.isnan(X[:, 2]) & ~((X[:, 2] == 1) & np.isnan(X[:, 3]))
+    if known.any():
+        predicted[known] = roi_from_target(load_roi_model()["model"].predict(X[known]))
+    return predicted
+
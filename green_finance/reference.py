@@ -0,0 +1,135 @@
+"""Reference tables shared by the ROI calculator and its engines.
+
+The tables live in a versioned JSON file (``data/reference.json``, or the
+path in ``GREEN_FINANCE_REFERENCE``) and are loaded once per process into a
+``ReferenceData`` with the lookup indexes prebuilt.  ``current()`` re-stats
+the file at most every ``RELOAD_CHECK_SECONDS`` and reloads it when its
+mtime changes, so tariff updates go live without restarting the server.  A
+file that fails to load is logged and the previous tables stay in use.
+
+Module attributes (``reference.solar_data``, ``reference.tariff_engine``,
+...) always resolve against the current tables.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+from .tariff import TariffEngine
+
+DATA_PATH = os.environ.get(
+    "GREEN_FINANCE_REFERENCE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "reference.json"),
+)
+SUPPORTED_VERSIONS = (1,)
+RELOAD_CHECK_SECONDS = 1.0
+
+FIELDS = (
+    "version", "solar_data", "water_data", "water_tariffs", "default_water_tariff",
+    "tariffs_tiers", "house_types", "solar_bill_map", "tariff_engine", "bill_bands",
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BillBands:
+    """Interval index over the ``solar_bill_map`` bill bands.
+
+    Bands are sorted by their lower bound and must not overlap, so the band
+    a bill falls in is found with one binary search (``searchsorted``).
+    """
+
+    def __init__(self, rows):
+        rows = sorted(rows, key=lambda row: row["min"])
+        self.mins = np.array([row["min"] for row in rows], dtype=float)
+        self.maxs = np.array([row["max"] for row in rows], dtype=float)
+        self.sizes = np.array([row["size"] for row in rows], dtype=float)
+        self.savings = np.array([np.mean(row["saving"]) for row in rows], dtype=float)
+        if np.any(self.mins[1:] <= self.maxs[:-1]):
+            raise ValueError("solar_bill_map bands overlap")
+
+    def find(self, bill):
+        """Band index for each bill and whether the bill is inside that band."""
+        bill = np.asarray(bill, dtype=float)
+        band = np.clip(np.searchsorted(self.mins, bill, side="right") - 1, 0, len(self.mins) - 1)
+        return band, (bill >= self.mins[band]) & (bill <= self.maxs[band])
+
+
+class ReferenceData:
+    """One loaded version of the reference tables."""
+
+    def __init__(self, raw, mtime=None):
+        self.version = raw["version"]
+        if self.version not in SUPPORTED_VERSIONS:
+            raise ValueError(f"unsupported reference data version {self.version}")
+        self.mtime = mtime
+        self.solar_data = dict(raw["solar_data"])
+        self.water_data = dict(raw["water_data"])
+        self.water_tariffs = dict(raw["water_tariffs"])
+        self.default_water_tariff = raw["default_water_tariff"]
+        # JSON has no infinity: an open-ended top tier is stored as null
+        self.tariffs_tiers = [
+            (low, float("inf") if high is None else high, rate) for low, high, rate in raw["tariffs_tiers"]
+        ]
+        self.house_types = {
+            name: {key: tuple(value) for key, value in spec.items()} for name, spec in raw["house_types"].items()
+        }
+        self.solar_bill_map = [dict(row, saving=tuple(row["saving"])) for row in raw["solar_bill_map"]]
+        self.tariff_engine = TariffEngine(self.tariffs_tiers)
+        self.bill_bands = BillBands(self.solar_bill_map)
+        self.water_tariff_index = _index(self.water_tariffs)
+        self.system_range_index = _index({name: spec["system_range"] for name, spec in self.house_types.items()})
+
+
+def _index(table):
+    """Sorted keys and matching values of a small dict, for binary search."""
+    names = np.array(sorted(table))
+    return names, np.array([table[name] for name in names.tolist()], dtype=float)
+
+
+def load(path=None):
+    """Read and index a reference data file (``DATA_PATH`` by default)."""
+    path = path or DATA_PATH
+    mtime = os.stat(path).st_mtime_ns
+    with open(path, encoding="utf-8") as f:
+        return ReferenceData(json.load(f), mtime)
+
+
+_lock = threading.Lock()
+_data = None
+_checked_at = 0.0
+_failed_mtime = None
+
+
+def current():
+    """The reference tables, reloaded if the data file changed on disk."""
+    global _data, _checked_at, _failed_mtime
+    now = time.monotonic()
+    if _data is not None and now - _checked_at < RELOAD_CHECK_SECONDS:
+        return _data
+    with _lock:
+        if _data is None:
+            _data = load()
+        elif now - _checked_at >= RELOAD_CHECK_SECONDS:
+            mtime = None
+            try:
+                mtime = os.stat(DATA_PATH).st_mtime_ns
+                if mtime not in (_data.mtime, _failed_mtime):
+                    _data = load()
+                    logger.info("reloaded reference data version %s from %s", _data.version, DATA_PATH)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                # Retry only once the file changes again
+                _failed_mtime = mtime
+                logger.warning("keeping reference data version %s, reload failed: %s", _data.version, e)
+        _checked_at = now
+        return _data
+
+
+def __getattr__(name):
+    if name in FIELDS:
+        return getattr(current(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,146 @@
+"""PDF ROI reports, built off the Streamlit script thread.
+
+A scenario is a dict with ``state``, ``category``, ``investment``,
+``monthly_savings`` and ``years``.  ``submit_pdf`` queues one report on a
+shared worker pool and returns a ``Future``; the apps check it every
+``POLL_SECONDS`` from a fragment instead of blocking the rerun on it.
+``submit_reports_zip`` does the same for many scenarios: their PDFs are
+rendered on the same pool and written into one ZIP archive in scenario
+order.  Reports embed the cached chart PNGs from ``green_finance.charts``
+and include the full monthly table, split into page-sized chunks.
+"""
+
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+
+from . import charts
+from . import export
+from . import roi as roi_engine
+
+REPORT_WORKERS = 4
+POLL_SECONDS = 1
+MONTHLY_ROWS_PER_TABLE = 36
+COL_WIDTHS = [100, 200]
+
+_executor = ThreadPoolExecutor(max_workers=REPORT_WORKERS, thread_name_prefix="roi-report")
+# Archive jobs only wait on PDF futures, so they get their own threads and never hold a report worker
+_archive_executor = ThreadPoolExecutor(max_workers=REPORT_WORKERS, thread_name_prefix="roi-report-zip")
+
+
+@lru_cache(maxsize=None)
+def _styles():
+    """Paragraph and table styles, built once per process."""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import TableStyle
+
+    def table_style(header, body):
+        return TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), header),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), body),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+
+    return {
+        "text": getSampleStyleSheet(),
+        "monthly": table_style(colors.green, colors.beige),
+        "yearly": table_style(colors.blue, colors.lightgrey),
+    }
+
+
+def report_filename(scenario):
+    return f"roi_report_{scenario['state']}_{scenario['category']}.pdf"
+
+
+def _table(header, rows, style):
+    from reportlab.platypus import Table
+
+    table = Table([header] + rows, colWidths=COL_WIDTHS, repeatRows=1)
+    table.setStyle(style)
+    return table
+
+
+def build_pdf(scenario):
+    """Render one scenario's ROI report and return the PDF bytes."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer
+
+    state, category = scenario["state"], scenario["category"]
+    investment, monthly_savings, years = scenario["investment"], scenario["monthly_savings"], scenario["years"]
+    metrics = roi_engine.roi_metrics(investment, monthly_savings, years)
+    total_savings = float(metrics["total_savings"])
+    payback_months = float(metrics["payback_months"])
+    months, savings = roi_engine.cumulative_savings(monthly_savings, years)
+    yearly = export.yearly_rollup(savings)
+
+    styles = _styles()
+    text = styles["text"]
+    elements = [
+        Paragraph("ROI Report - Green Investment", text['Title']),
+        Spacer(1, 12),
+        Paragraph(f"State: {state}", text['Normal']),
+        Paragraph(f"Category: {category}", text['Normal']),
+        Paragraph(f"Initial Investment: RM {investment:,.2f}", text['Normal']),
+        Paragraph(f"Total Savings: RM {total_savings:,.2f}", text['Normal']),
+        Paragraph(f"ROI: {float(metrics['roi']):.2f}%", text['Normal']),
+    ]
+    if payback_months != float('inf'):
+        elements.append(Paragraph(f"Payback Period: {payback_months:.1f} months (~{payback_months / 12:.1f} years)", text['Normal']))
+    else:
+        elements.append(Paragraph("Payback Period: N/A", text['Normal']))
+    elements.append(Spacer(1, 12))
+
+    chart_pngs = [
+        charts.cumulative_savings_png(state, category, investment, monthly_savings, years),
+        charts.investment_vs_savings_png(state, category, investment, total_savings, years),
+    ]
+    for png in chart_pngs:
+        elements.append(Image(BytesIO(png), width=4.5 * inch, height=3 * inch))
+        elements.append(Spacer(1, 12))
+
+    elements.append(Paragraph("Monthly Cumulative Savings", text['Heading2']))
+    monthly_rows = [[int(m), f"RM {s:,.2f}"] for m, s in zip(months, savings)]
+    for start in range(0, len(monthly_rows), MONTHLY_ROWS_PER_TABLE):
+        chunk = monthly_rows[start:start + MONTHLY_ROWS_PER_TABLE]
+        elements.append(_table(["Month", "Cumulative Savings"], chunk, styles["monthly"]))
+
+    elements.append(Spacer(1, 12))
+    elements.append(Paragraph("Yearly Cumulative Savings", text['Heading2']))
+    yearly_rows = [[year, f"RM {s:,.2f}"] for year, s in enumerate(yearly, start=1)]
+    elements.append(_table(["Year", "Yearly Cumulative Savings"], yearly_rows, styles["yearly"]))
+
+    buffer = BytesIO()
+    SimpleDocTemplate(buffer, pagesize=A4).build(elements)
+    return buffer.getvalue()
+
+
+def submit_pdf(scenario):
+    """Queue ``build_pdf`` on the report pool; returns a ``Future`` of bytes."""
+    return _executor.submit(build_pdf, dict(scenario))
+
+
+def build_reports_zip(scenarios):
+    """Render every scenario on the report pool and return one ZIP archive's bytes."""
+    jobs = [(scenario, submit_pdf(scenario)) for scenario in scenarios]
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        names = set()
+        for index, (scenario, job) in enumerate(jobs, start=1):
+            name = report_filename(scenario)
+            if name in names:
+                name = name.replace(".pdf", f"_{index}.pdf")
+            names.add(name)
+            archive.writestr(name, job.result())
+    return buffer.getvalue()
+
+
+def submit_reports_zip(scenarios):
+    """Queue ``build_reports_zip``; returns a ``Future`` of the archive bytes."""
+    return _archive_executor.submit(build_reports_zip, [dict(scenario) for scenario in scenarios])
@@ -0,0 +1,179 @@
+"""Headless ROI engine.
+
+The same math the ROI Calculator tab runs for one scenario, written over
+NumPy arrays so a whole batch of scenarios is scored in one pass.  Every
+function accepts scalars or arrays; ``evaluate_portfolio`` takes a
+columnar batch (a DataFrame or a dict of sequences).
+"""
+
+import numpy as np
+
+from . import reference
+
+SOLAR = "Solar"
+WATER = "Water"
+
+# Fallback sizing when no bill band matches: RM saved per kWp per month
+SAVINGS_PER_KWP = 60
+DEFAULT_WATER_EFFICIENCY = 20
+SAVINGS_NOISE = 0.05
+
+
+def _lookup(keys, index, default=np.nan):
+    """Map an array of keys through a prebuilt ``(names, values)`` index.
+
+    Values may be tuples, in which case the result gains a trailing axis.
+    """
+    keys = np.asarray(keys)
+    names, values = index
+    pos = np.clip(np.searchsorted(names, keys), 0, len(names) - 1)
+    found = names[pos] == keys
+    return np.where(found.reshape(found.shape + (1,) * (values.ndim - 1)), values[pos], default)
+
+
+def fill_house_type(house_type):
+    """House types with blanks set to the first (smallest) one, the apps' default.
+
+    A blank is an empty string, ``None`` or NaN (how pandas reads an empty
+    CSV cell).
+    """
+    house_type = np.asarray(house_type)
+    if house_type.dtype.kind in "fO":
+        missing = (house_type == None) | (house_type != house_type)  # noqa: E711 - elementwise, NaN != NaN
+        house_type = np.where(missing, "", house_type)
+    house_type = house_type.astype(str)
+    return np.where(house_type == "", next(iter(reference.current().house_types)), house_type)
+
+
+def house_system_range(house_type):
+    """Minimum and maximum system size (kWp) for each house type (NaN if unknown)."""
+    ranges = _lookup(fill_house_type(house_type), reference.current().system_range_index)
+    return ranges[..., 0], ranges[..., 1]
+
+
+def size_solar_from_bill(monthly_bill, house_type):
+    """Recommended system size and default monthly savings from a bill.
+
+    Bills inside a ``solar_bill_map`` band take that band's size (clipped to
+    the house range) and mean saving; other bills fall back to the middle of
+    the house range.  Returns ``(system_size_kw, monthly_savings, matched)``.
+    """
+    bill = np.asarray(monthly_bill, dtype=float)
+    system_min, system_max = house_system_range(np.broadcast_to(house_type, bill.shape))
+    bands = reference.current().bill_bands
+    band, matched = bands.find(bill)
+    fallback_size = (system_min + system_max) / 2
+    size = np.where(matched, np.clip(bands.sizes[band], system_min, system_max), fallback_size)
+    monthly_savings = np.where(matched, np.trunc(bands.savings[band]), np.trunc(fallback_size * SAVINGS_PER_KWP))
+    return size, monthly_savings, matched
+
+
+def size_solar_from_kwh(monthly_kwh, house_type):
+    """Estimated system size and default monthly savings from consumption."""
+    kwh = np.asarray(monthly_kwh, dtype=float)
+    system_min, system_max = house_system_range(np.broadcast_to(house_type, kwh.shape))
+    size = np.maximum(system_min, np.minimum(kwh / 100.0, system_max))
+    return size, np.trunc(size * SAVINGS_PER_KWP)
+
+
+def water_bill(monthly_usage, state):
+    """Monthly water bill (RM) at the state's tariff."""
+    usage = np.asarray(monthly_usage, dtype=float)
+    data = reference.current()
+    tariff = _lookup(np.broadcast_to(state, usage.shape), data.water_tariff_index, data.default_water_tariff)
+    return usage * tariff
+
+
+def water_savings(monthly_bill, efficiency=DEFAULT_WATER_EFFICIENCY):
+    """Default monthly savings for an efficiency improvement in percent."""
+    return np.trunc(np.asarray(monthly_bill, dtype=float) * (np.asarray(efficiency, dtype=float) / 100))
+
+
+def roi_metrics(investment, monthly_savings, years):
+    """Total savings, ROI (%) and payback for flat monthly savings."""
+    investment = np.asarray(investment, dtype=float)
+    monthly_savings = np.asarray(monthly_savings, dtype=float)
+    years = np.asarray(years, dtype=float)
+    total_savings = monthly_savings * 12 * years
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = ((total_savings - investment) / investment) * 100
+        payback_months = np.where(monthly_savings <= 0, np.inf, investment / monthly_savings)
+    return {
+        "total_savings": total_savings,
+        "roi": roi,
+        "payback_months": payback_months,
+        "payback_years": payback_months / 12,
+    }
+
+
+def cumulative_savings(monthly_savings, years, noise=SAVINGS_NOISE, seed=0):
+    """Month numbers and the noisy cumulative savings path for the chart.
+
+    Uses its own ``RandomState`` so the path matches the old
+    ``np.random.seed(0)`` draw without touching global NumPy state.
+    """
+    n_months = int(years) * 12
+    months = np.arange(1, n_months + 1)
+    rng = np.random.RandomState(seed)
+    draws = rng.normal(0, monthly_savings * noise, n_months)
+    return months, np.cumsum(np.full(n_months, monthly_savings) + draws)
+
+
+def _column(scenarios, name, n, default=np.nan, dtype=float):
+    if name in scenarios:
+        return np.asarray(scenarios[name], dtype=dtype)
+    return np.full(n, default, dtype=dtype)
+
+
+def evaluate_portfolio(scenarios):
+    """Score a columnar batch of scenarios in one vectorized pass.
+
+    Required columns are ``state``, ``category``, ``investment`` and
+    ``years``, plus ``monthly_bill`` and/or ``monthly_consumption`` (NaN where
+    not given; the bill wins when both are set).  Optional columns:
+    ``house_type`` (Solar; blank means the default, see ``fill_house_type``,
+    and an unknown type scores as NaN), ``efficiency`` in percent (Water, default 20) and
+    ``monthly_savings`` to override the computed default.  Categories other
+    than Solar and Water score as NaN.  Returns a dict of equal-length arrays.
+    """
+    category = np.asarray(scenarios["category"])
+    n = len(category)
+    state = np.asarray(scenarios["state"])
+    investment = _column(scenarios, "investment", n)
+    years = _column(scenarios, "years", n)
+    bill = _column(scenarios, "monthly_bill", n)
+    consumption = _column(scenarios, "monthly_consumption", n)
+    house_type = fill_house_type(_column(scenarios, "house_type", n, "", dtype=object))
+    efficiency = _column(scenarios, "efficiency", n, DEFAULT_WATER_EFFICIENCY)
+    override = _column(scenarios, "monthly_savings", n)
+
+    is_solar = category == SOLAR
+    is_water = category == WATER
+    has_bill = ~np.isnan(bill)
+
+    # Solar: bill -> kWh plus band sizing, or kWh -> bill plus estimate
+    tariff_engine = reference.current().tariff_engine
+    solar_kwh = np.where(has_bill, tariff_engine.kwh_from_bill(np.nan_to_num(bill)), consumption)
+    solar_bill = np.where(has_bill, bill, tariff_engine.bill_from_kwh(solar_kwh))
+    band_size, band_savings, _ = size_solar_from_bill(np.nan_to_num(bill), house_type)
+    est_size, est_savings = size_solar_from_kwh(solar_kwh, house_type)
+    solar_size = np.where(has_bill, band_size, est_size)
+    # No size without a known house type, so no savings either
+    solar_savings = np.where(np.isnan(solar_size), np.nan, np.where(has_bill, band_savings, est_savings))
+
+    # Water: consumption is priced at the state tariff
+    water_monthly_bill = np.where(has_bill, bill, water_bill(np.nan_to_num(consumption), state))
+    water_default = water_savings(water_monthly_bill, efficiency)
+
+    monthly_bill = np.select([is_solar, is_water], [solar_bill, water_monthly_bill], np.nan)
+    default_savings = np.select([is_solar, is_water], [solar_savings, water_default], np.nan)
+    monthly_savings = np.where(np.isnan(override), default_savings, override)
+
+    result = {
+        "monthly_bill": monthly_bill,
+        "monthly_kwh": np.where(is_solar, solar_kwh, np.nan),
+        "system_size_kw": np.where(is_solar, solar_size, np.nan),
+        "monthly_savings": monthly_savings,
+    }
+    result.update(roi_metrics(investment, monthly_savings, years))
+    return result
@@ -0,0 +1,196 @@
+"""Process-wide cache of single-scenario results, shared by all sessions.
+
+Most visitors ask about the same few scenarios (the default RM 300 bill, a
+terrace house, five years), so the per-scenario computations behind the
+results pages are memoized once per server process instead of once per
+session.  Keys are the normalized inputs: numbers become floats rounded to
+``KEY_DECIMALS`` (so ``300``, ``300.0`` and ``np.int64(300)`` are one
+entry), strings are stripped, and defaults are filled in before hashing.
+Every key also carries the loaded reference data's mtime, so results follow
+a tariff or yield update as soon as ``reference.current()`` reloads it.
+
+Each cache holds at most ``max_entries`` results, evicting the least
+recently used, and drops entries older than ``ttl`` seconds.  Cached arrays are made
+read-only, since every session gets the same object.  ``max_entries=0``
+turns a cache off.  Defaults come from ``GREEN_FINANCE_CACHE_ENTRIES`` and
+``GREEN_FINANCE_CACHE_TTL``.
+"""
+
+import functools
+import inspect
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from . import cashflow, compare, prediction, reference, solar
+from . import roi as roi_engine
+
+MAX_ENTRIES = int(os.environ.get("GREEN_FINANCE_CACHE_ENTRIES", 4096))
+TTL_SECONDS = float(os.environ.get("GREEN_FINANCE_CACHE_TTL", 3600))
+KEY_DECIMALS = 6
+
+_CACHES = {}
+
+
+class ScenarioCache:
+    """Thread-safe LRU map with a per-entry time to live."""
+
+    def __init__(self, name, max_entries=MAX_ENTRIES, ttl=TTL_SECONDS, clock=time.monotonic):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get_or_compute(self, key, compute):
+        """Cached value for ``key``, computing and storing it on a miss."""
+        if self.max_entries <= 0:
+            return compute()
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+        # Computed outside the lock: two sessions missing the same key at once both compute it
+        value = _freeze(compute())
+        with self._lock:
+            self._entries[key] = (now, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else float("nan"),
+        }
+
+
+def normalize(value):
+    """Hashable canonical form of a scenario input."""
+    if isinstance(value, np.ndarray) and value.ndim == 0:
+        value = value.item()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        return round(float(value), KEY_DECIMALS) + 0.0  # + 0.0 folds -0.0 into 0.0
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (tuple, list)):
+        return tuple(normalize(item) for item in value)
+    raise TypeError(f"cannot use {type(value).__name__} in a scenario cache key")
+
+
+def _freeze(value):
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _freeze(item)
+    elif isinstance(value, tuple):
+        for item in value:
+            _freeze(item)
+    return value
+
+
+def memoize(name, max_entries=None, ttl=None):
+    """Cache a function of scalar scenario inputs in the ``name`` cache."""
+    def decorate(fn):
+        signature = inspect.signature(fn)
+        cache = _CACHES[name] = ScenarioCache(
+            name, MAX_ENTRIES if max_entries is None else max_entries, TTL_SECONDS if ttl is None else ttl)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (reference.current().mtime, *(normalize(value) for value in bound.arguments.values()))
+            return cache.get_or_compute(key, lambda: fn(*bound.args, **bound.kwargs))
+        wrapper.cache = cache
+        return wrapper
+    return decorate
+
+
+def stats():
+    """``{cache name: counters}`` for every scenario cache in this process."""
+    return {name: cache.stats() for name, cache in _CACHES.items()}
+
+
+def clear():
+    for cache in _CACHES.values():
+        cache.clear()
+
+
+def configure(max_entries=None, ttl=None):
+    """Resize (``0`` disables) or re-time every scenario cache; clears them."""
+    for cache in _CACHES.values():
+        if max_entries is not None:
+            cache.max_entries = max_entries
+        if ttl is not None:
+            cache.ttl = ttl
+        cache.clear()
+
+
+# ---------- cached scenario computations ----------
+@memoize("roi")
+def roi_summary(investment, monthly_savings, years):
+    """ROI metrics as floats plus the chart's months and cumulative savings."""
+    metrics = {key: float(value) for key, value in roi_engine.roi_metrics(investment, monthly_savings, years).items()}
+    months, savings = roi_engine.cumulative_savings(monthly_savings, years)
+    return dict(metrics, months=months, savings=savings)
+
+
+@memoize("cashflow")
+def discounted_cash_flow(investment, monthly_savings, years, discount_rate=cashflow.DEFAULT_DISCOUNT_RATE,
+                         escalation=cashflow.DEFAULT_ESCALATION, degradation=cashflow.DEFAULT_DEGRADATION):
+    """``cashflow.evaluate`` for one scenario, as floats."""
+    result = cashflow.evaluate(investment, monthly_savings, years, discount_rate, escalation, degradation)
+    return {key: float(values[0]) for key, values in result.items()}
+
+
+@memoize("solar")
+def solar_hourly(state, system_kw, monthly_kwh):
+    """``solar.simulate`` for one scenario: ``(12,)`` arrays and float averages."""
+    result = solar.simulate(state, system_kw, monthly_kwh)
+    return {key: float(values[0]) if values.ndim == 1 else values[0] for key, values in result.items()}
+
+
+@memoize("prediction")
+def predicted_roi(state, category, house_type, monthly_bill, investment, years):
+    """Model-predicted ROI (%) for one scenario."""
+    return float(prediction.predict_roi({
+        "state": state, "category": category, "house_type": house_type,
+        "monthly_bill": monthly_bill, "investment": investment, "years": years,
+    })[0])
+
+
+@memoize("compare")
+def state_comparison(investment, years, monthly_kwh, monthly_water_m3, house_type,
+                     efficiency=roi_engine.DEFAULT_WATER_EFFICIENCY):
+    """``compare.compare_states`` columns for one set of inputs."""
+    return compare.compare_states(investment, years, monthly_kwh, monthly_water_m3, house_type, efficiency)
@@ -0,0 +1,86 @@
+"""ROI sensitivity sweep over investment x monthly savings x horizon.
+
+The grid is evaluated with NumPy broadcasting a slice of investments at a
+time, so peak temporary memory is bounded by ``slice_size`` rows no matter
+how large the grid is.  ROI is independent per cell, so slices can also be
+streamed with ``iter_roi_grid`` without materialising the full cube;
+``roi_csv`` writes the download that way.
+"""
+
+import io
+
+import numpy as np
+
+from . import export
+
+DEFAULT_SLICE = 128
+
+
+def iter_roi_grid(investment, monthly_savings, years, dtype=np.float32, slice_size=DEFAULT_SLICE):
+    """Yield ``(start, stop, roi, payback_months)`` for slices of investments.
+
+    ``roi`` has shape ``(stop - start, len(monthly_savings), len(years))`` in
+    percent; ``payback_months`` has shape ``(stop - start, len(monthly_savings))``
+    since payback does not depend on the horizon.
+    """
+    investment = np.asarray(investment, dtype=dtype)
+    savings = np.asarray(monthly_savings, dtype=dtype)
+    months = np.asarray(years, dtype=dtype) * 12
+    # ROI = (savings * months / investment - 1) * 100, folded into one product
+    savings_months = savings[:, None] * months[None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for start in range(0, len(investment), slice_size):
+            inv = investment[start:start + slice_size]
+            roi = savings_months[None, :, :] / inv[:, None, None]
+            roi -= 1
+            roi *= 100
+            payback = np.where(savings[None, :] > 0, inv[:, None] / savings[None, :], np.inf).astype(dtype)
+            yield start, start + len(inv), roi, payback
+
+
+def roi_grid(investment, monthly_savings, years, dtype=np.float32, slice_size=DEFAULT_SLICE):
+    """Full ROI cube and payback matrix, filled slice by slice.
+
+    Returns a dict with the three axes plus ``roi`` of shape
+    ``(len(investment), len(monthly_savings), len(years))`` and
+    ``payback_months`` of shape ``(len(investment), len(monthly_savings))``.
+    """
+    investment = np.asarray(investment)
+    monthly_savings = np.asarray(monthly_savings)
+    years = np.asarray(years)
+    roi = np.empty((len(investment), len(monthly_savings), len(years)), dtype=dtype)
+    payback = np.empty((len(investment), len(monthly_savings)), dtype=dtype)
+    for start, stop, roi_slice, payback_slice in iter_roi_grid(investment, monthly_savings, years, dtype, slice_size):
+        roi[start:stop] = roi_slice
+        payback[start:stop] = payback_slice
+    return {
+        "investment": investment,
+        "monthly_savings": monthly_savings,
+        "years": years,
+        "roi": roi,
+        "payback_months": payback,
+    }
+
+
+def grid_axes(investment_range, savings_range, steps):
+    """Evenly spaced investment and monthly savings axes for a sweep."""
+    return np.linspace(*investment_range, steps), np.linspace(*savings_range, steps)
+
+
+def roi_csv(investment, monthly_savings, years, slice_size=DEFAULT_SLICE):
+    """The grid as long-form CSV bytes, written one investment slice at a time."""
+    investment = np.asarray(investment)
+    monthly_savings = np.asarray(monthly_savings)
+    years = np.asarray(years)
+    buffer = io.BytesIO()
+    for start, stop, roi, payback in iter_roi_grid(investment, monthly_savings, years, slice_size=slice_size):
+        shape = roi.shape
+        inv, savings, horizon = np.meshgrid(investment[start:stop], monthly_savings, years, indexing="ij")
+        export.write_csv({
+            "Investment (RM)": inv.ravel(),
+            "Monthly Savings (RM)": savings.ravel(),
+            "Years": horizon.ravel(),
+            "ROI (%)": roi.ravel(),
+            "Payback (months)": np.broadcast_to(payback[:, :, None], shape).ravel(),
+        }, buffer, header=start == 0)
+    return buffer.getvalue()
@@ -0,0 +1,83 @@
+"""Closed-form tiered tariff engine.
+
+The tiers are the same ``(low, high, rate)`` tuples the apps use for
+``tariffs_tiers``.  Cumulative kWh and bill breakpoints are precomputed
+once, so bill -> kWh and kWh -> bill become a ``searchsorted`` over the
+tier edges instead of a scan over every kWh.  All methods accept scalars
+or NumPy arrays.
+"""
+
+import numpy as np
+
+
+def round_sen(values):
+    """Round RM amounts to sen exactly like the built-in ``round(x, 2)``.
+
+    ``np.round`` scales by 100 before rounding, which flips values that sit
+    a hair above a half-sen tie (e.g. ``415.58500000000004``).  Those
+    near-ties are rare, so they are re-rounded one by one.
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.atleast_1d(np.round(values, 2))
+    flat = np.atleast_1d(values)
+    scaled = flat * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(v, 2) for v in flat[near_tie].tolist()]
+    return rounded.reshape(values.shape)
+
+
+class TariffEngine:
+    def __init__(self, tiers):
+        lows = np.array([low for low, _, _ in tiers], dtype=float)
+        highs = np.array([high for _, high, _ in tiers], dtype=float)
+        self.rates = np.array([rate for _, _, rate in tiers], dtype=float)
+        widths = highs - lows + 1
+        # kWh and RM at the start of each tier
+        self.kwh_edges = np.concatenate(([0.0], np.cumsum(widths[:-1])))
+        self.bill_edges = np.concatenate(([0.0], np.cumsum(widths[:-1] * self.rates[:-1])))
+
+    @staticmethod
+    def _out(values, scalar):
+        return values.item() if scalar else values
+
+    def _raw_bill(self, kwh):
+        kwh = np.maximum(kwh, 0.0)
+        i = np.searchsorted(self.kwh_edges, kwh, side="right") - 1
+        return self.bill_edges[i] + (kwh - self.kwh_edges[i]) * self.rates[i]
+
+    def bill_from_kwh(self, kwh):
+        """Monthly bill (RM) for a consumption in kWh, rounded to sen."""
+        scalar = np.ndim(kwh) == 0
+        bill = round_sen(self._raw_bill(np.asarray(kwh, dtype=float)))
+        return self._out(bill, scalar)
+
+    def kwh_from_bill(self, target_bill, max_kwh=None):
+        """Smallest whole kWh (>= 1) whose bill reaches ``target_bill``.
+
+        Matches the old ``calculate_kwh_from_bill`` scan exactly but is not
+        capped unless ``max_kwh`` is given.
+        """
+        scalar = np.ndim(target_bill) == 0
+        target = np.asarray(target_bill, dtype=float)
+        i = np.searchsorted(self.bill_edges, target, side="right") - 1
+        i = np.maximum(i, 0)
+        exact = self.kwh_edges[i] + (target - self.bill_edges[i]) / self.rates[i]
+        kwh = np.maximum(np.ceil(exact), 1.0)
+        # The scan compares rounded bills, so nudge by one kWh where
+        # rounding to sen moves the crossing point.
+        below = round_sen(self._raw_bill(kwh)) < target
+        kwh = np.where(below, kwh + 1, kwh)
+        above = (kwh > 1) & (round_sen(self._raw_bill(kwh - 1)) >= target)
+        kwh = np.where(above, kwh - 1, kwh)
+        if max_kwh is not None:
+            kwh = np.minimum(kwh, max_kwh)
+        return self._out(kwh.astype(np.int64), scalar)
+
+    def solar_savings(self, monthly_consumption_kwh, solar_offset_kwh):
+        """Bill reduction when solar offsets the cheapest tiers first."""
+        scalar = np.ndim(monthly_consumption_kwh) == 0 and np.ndim(solar_offset_kwh) == 0
+        consumption = np.asarray(monthly_consumption_kwh, dtype=float)
+        offset = np.maximum(np.asarray(solar_offset_kwh, dtype=float), 0.0)
+        savings = round_sen(self._raw_bill(np.minimum(consumption, offset)))
+        return self._out(savings, scalar)
@@ -0,0 +1,127 @@
+"""Per-rerun timing of the app sections.
+
+Disabled by default.  Set ``GREEN_FINANCE_TIMING=1`` to time every rerun:
+each app marks section boundaries with ``timer.lap(name)`` (time since the
+previous mark) and wraps nested work such as the OpenAI call in
+``timer.span(name)``.  ``finish()`` appends one JSON line per rerun to
+``GREEN_FINANCE_TIMING_LOG`` (default ``timing.jsonl``) and
+``show_debug_panel`` renders the breakdown in the sidebar, next to the
+hit counters of the chart caches.
+
+When disabled, ``start_rerun`` returns a shared no-op timer, so the cost
+in the apps is one attribute lookup and call per mark.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+
+ENABLED = os.environ.get("GREEN_FINANCE_TIMING", "") not in ("", "0")
+LOG_PATH = os.environ.get("GREEN_FINANCE_TIMING_LOG", "timing.jsonl")
+
+_log_lock = threading.Lock()
+
+
+class RerunTimer:
+    def __init__(self, app, session_id=None, log_path=LOG_PATH):
+        self.app = app
+        self.session_id = session_id
+        self.log_path = log_path
+        self.started = self._last = time.perf_counter()
+        self.sections = []  # (name, seconds), laps and spans in completion order
+
+    def lap(self, name):
+        """Record the time since the previous mark under ``name``."""
+        now = time.perf_counter()
+        self.sections.append((name, now - self._last))
+        self._last = now
+
+    @contextlib.contextmanager
+    def span(self, name):
+        """Time a nested block; it is also included in the enclosing lap."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sections.append((name, time.perf_counter() - start))
+
+    def record(self):
+        """The rerun as a dict; a section marked more than once is summed."""
+        sections_ms = {}
+        for name, seconds in self.sections:
+            sections_ms[name] = sections_ms.get(name, 0.0) + seconds * 1000
+        return {
+            "ts": time.time(),
+            "app": self.app,
+            "session": self.session_id,
+            "total_ms": (time.perf_counter() - self.started) * 1000,
+            "sections_ms": sections_ms,
+        }
+
+    def finish(self):
+        """Close the rerun, append it to the JSONL log and return the record."""
+        record = self.record()
+        if self.log_path:
+            line = json.dumps(record) + "\n"
+            with _log_lock, open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(line)
+        return record
+
+
+class _NullTimer:
+    _context = contextlib.nullcontext()
+
+    def lap(self, name):
+        pass
+
+    def span(self, name):
+        return self._context
+
+    def finish(self):
+        return None
+
+
+NULL_TIMER = _NullTimer()
+
+
+def _session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+
+def start_rerun(app):
+    """Timer for the current rerun, or the no-op timer when timing is off."""
+    if not ENABLED:
+        return NULL_TIMER
+    return RerunTimer(app, _session_id())
+
+
+def show_debug_panel(record, container=None):
+    """Breakdown of a finished rerun (no-op when timing is off).
+
+    Goes to the sidebar unless ``container`` is given; fragments must pass
+    ``st`` since they cannot write outside their own body.
+    """
+    if record is None:
+        return
+    if container is None:
+        import streamlit as st
+
+        container = st.sidebar
+    panel = container.expander(f"⏱️ Rerun timings ({record['app']})", expanded=False)
+    panel.write(f"**Total: {record['total_ms']:.1f} ms**")
+    panel.table([{"Section": name, "ms": round(ms, 2)} for name, ms in record["sections_ms"].items()])
+
+    from . import charts
+
+    panel.write("**Chart caches (this process)**")
+    panel.table([
+        {"Chart": name, "Hits": info.hits, "Misses": info.misses, "Cached": info.currsize}
+        for name, info in charts.chart_cache_info().items()
+    ])
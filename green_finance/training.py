@@ -0,0 +1,193 @@
+"""Offline training of the ROI prediction model.
+
+The training table has the bulk-upload columns (``state``, ``category``,
+``house_type``, ``monthly_bill``, ``investment``, ``years``) and the
+observed ``roi`` in percent.  Pass a CSV of real outcomes with ``--data``;
+without one, a table is simulated from the calculators themselves: solar
+savings come from the hourly net-metering engine (so irradiation matters
+per state), water savings from the efficiency default, and both are
+scattered by a log-normal realization factor.  Investments are drawn
+log-uniformly over ``INVESTMENT_RANGE``, the range the apps accept, so
+no prediction the UI can ask for is an extrapolation.
+
+A ``HistGradientBoostingRegressor`` is fitted on ``prediction.FEATURES``,
+constrained so ROI never rises with investment or falls with the horizon.
+It learns ``prediction.roi_target`` (the log of the payback multiple), which
+is linear in log investment, rather than ROI itself, which spans orders of
+magnitude across the range.  The model is scored on a hold-out split (MAE, RMSE, R², next to the six-point linear
+model it replaces) and timed for single-row and batched inference.  The
+artifact is written uncompressed, so ``prediction.load_roi_model`` can
+memory-map it.
+
+Run from the repository root:
+
+    python -m green_finance.training                     # simulate 200k rows
+    python -m green_finance.training --data outcomes.csv
+"""
+
+import argparse
+import os
+import platform
+import statistics
+import time
+
+import numpy as np
+
+from . import prediction, reference, solar
+from .roi import SOLAR, WATER, evaluate_portfolio, roi_metrics
+
+DEFAULT_ROWS = 200_000
+TEST_SHARE = 0.2
+REALIZATION_SIGMA = 0.15
+INVESTMENT_RANGE = (1000, 100000)  # the apps' investment input and range slider
+LATENCY_REPEAT = 200
+BATCH_ROWS = 100_000
+SEED = 0
+FEATURE_INVESTMENT = prediction.FEATURES.index("investment")
+# ROI falls as investment grows and rises with the horizon (savings are never negative)
+MONOTONIC = {"investment": -1, "years": 1}
+
+# Six-point investment -> ROI fit used before this model, kept for comparison
+LEGACY_INVESTMENT = np.array([1000, 5000, 10000, 20000, 30000, 50000])
+LEGACY_ROI = np.array([8, 25, 45, 60, 75, 85])
+
+
+def simulate_dataset(rows=DEFAULT_ROWS, seed=SEED):
+    """Training columns for ``rows`` synthetic customers, with ``roi``."""
+    data = reference.current()
+    rng = np.random.default_rng(seed)
+    states = np.array(sorted(data.solar_data))
+    house_types = np.array(list(data.house_types))
+    scenarios = {
+        "state": rng.choice(states, rows),
+        "category": rng.choice([SOLAR, WATER], rows),
+        "house_type": rng.choice(house_types, rows),
+        "monthly_bill": np.round(rng.uniform(50, 1500, rows), 2),
+        "years": rng.integers(1, 11, rows).astype(float),
+    }
+    low, high = np.log(INVESTMENT_RANGE)
+    scenarios["investment"] = np.round(np.exp(rng.uniform(low, high, rows)), -2)
+    scored = evaluate_portfolio(scenarios)
+    is_solar = scenarios["category"] == SOLAR
+
+    savings = scored["monthly_savings"].copy()
+    savings[is_solar] = solar.simulate(
+        scenarios["state"][is_solar], scored["system_size_kw"][is_solar], scored["monthly_kwh"][is_solar]
+    )["monthly_savings"]
+    savings *= rng.lognormal(0, REALIZATION_SIGMA, rows)
+    scenarios["roi"] = roi_metrics(scenarios["investment"], savings, scenarios["years"])["roi"]
+    return scenarios
+
+
+def read_dataset(path):
+    """Training columns from a CSV of observed outcomes."""
+    from .bulk import read_columns
+
+    columns = read_columns(path)
+    if "roi" not in columns:
+        raise ValueError("missing column(s): roi")
+    return columns
+
+
+def _split(n, seed=SEED):
+    order = np.random.default_rng(seed).permutation(n)
+    n_test = int(n * TEST_SHARE)
+    return order[n_test:], order[:n_test]
+
+
+def _accuracy(actual, predicted):
+    error = predicted - actual
+    return {
+        "mae": float(np.mean(np.abs(error))),
+        "rmse": float(np.sqrt(np.mean(error ** 2))),
+        "r2": float(1 - np.sum(error ** 2) / np.sum((actual - actual.mean()) ** 2)),
+    }
+
+
+def _latency(model, X):
+    """Median single-row latency (ms) and batched throughput (rows/s)."""
+    single = []
+    for row in X[:LATENCY_REPEAT]:
+        started = time.perf_counter()
+        model.predict(row[None, :])
+        single.append((time.perf_counter() - started) * 1000)
+    batch = X[np.arange(BATCH_ROWS) % len(X)]
+    started = time.perf_counter()
+    model.predict(batch)
+    return {"single_ms": statistics.median(single), "batch_rows_per_s": BATCH_ROWS / (time.perf_counter() - started)}
+
+
+def train(columns, seed=SEED):
+    """Fit and evaluate on ``columns``; returns the artifact dict."""
+    from sklearn import __version__ as sklearn_version
+    from sklearn.ensemble import HistGradientBoostingRegressor
+
+    X = prediction.features(columns)
+    y = np.asarray(columns["roi"], dtype=float)
+    usable = ~np.isnan(X[:, 2]) & np.isfinite(y)
+    X, y = X[usable], y[usable]
+    train_rows, test_rows = _split(len(y), seed)
+
+    started = time.perf_counter()
+    monotonic = [MONOTONIC.get(name, 0) for name in prediction.FEATURES]
+    model = HistGradientBoostingRegressor(max_iter=300, learning_rate=0.1, monotonic_cst=monotonic, random_state=seed)
+    model.fit(X[train_rows], prediction.roi_target(y[train_rows]))
+    fit_s = time.perf_counter() - started
+
+    legacy = np.polyfit(LEGACY_INVESTMENT, LEGACY_ROI, 1)
+    metrics = {
+        "rows": int(len(y)),
+        "fit_s": fit_s,
+        "test": _accuracy(y[test_rows], prediction.roi_from_target(model.predict(X[test_rows]))),
+        "legacy_test": _accuracy(y[test_rows], np.polyval(legacy, X[test_rows, FEATURE_INVESTMENT])),
+        "latency": _latency(model, X[test_rows]),
+    }
+    return {
+        "version": prediction.MODEL_VERSION,
+        "features": list(prediction.FEATURES),
+        "model": model,
+        "metrics": metrics,
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sklearn_version": sklearn_version,
+        "python": platform.python_version(),
+    }
+
+
+def save(artifact, path=None):
+    """Write ``artifact`` uncompressed (memory-mappable), atomically."""
+    import joblib
+
+    path = path or prediction.model_path(artifact["version"])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(artifact, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def report(artifact):
+    metrics = artifact["metrics"]
+    print(f"ROI model v{artifact['version']}: {metrics['rows']:,} rows, fitted in {metrics['fit_s']:.1f} s")
+    for label, key in (("gradient boosting", "test"), ("legacy linear", "legacy_test")):
+        scores = metrics[key]
+        print(f"  {label:<18} MAE {scores['mae']:8.2f} pp   RMSE {scores['rmse']:8.2f} pp   R² {scores['r2']:6.3f}")
+    latency = metrics["latency"]
+    print(f"  inference: {latency['single_ms']:.2f} ms per single row, {latency['batch_rows_per_s']:,.0f} rows/s batched")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", help="CSV of observed outcomes (bulk columns plus roi)")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="rows to simulate without --data")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--out", help=f"artifact path (default {prediction.model_path()})")
+    args = parser.parse_args(argv)
+
+    columns = read_dataset(args.data) if args.data else simulate_dataset(args.rows, args.seed)
+    artifact = train(columns, args.seed)
+    report(artifact)
+    print(f"saved {save(artifact, args.out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from green_finance import reference, scenario_cache
+
+
+@pytest.fixture
+def reference_file(tmp_path, monkeypatch):
+    """A private copy of the reference data, reloaded on every ``current()``.
+
+    Returns a function that applies ``edit(raw_dict)`` to the file and moves
+    its mtime forward, as a deployment editing the JSON would.
+    """
+    path = tmp_path / "reference.json"
+    shutil.copy(reference.DATA_PATH, path)
+    monkeypatch.setattr(reference, "DATA_PATH", str(path))
+    monkeypatch.setattr(reference, "RELOAD_CHECK_SECONDS", 0.0)
+    monkeypatch.setattr(reference, "_data", None)
+    scenario_cache.clear()
+
+    def update(edit):
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        edit(raw)
+        previous = os.stat(path).st_mtime_ns
+        path.write_text(json.dumps(raw), encoding="utf-8")
+        os.utime(path, ns=(previous + 10**9, previous + 10**9))
+
+    yield update
+    scenario_cache.clear()
@@ -0,0 +1,50 @@
+import json
+import threading
+
+from green_finance.advisor import AnswerCache, get_advisor, normalize_question
+
+
+def test_normalize_question():
+    assert normalize_question("  What is  ROI?? ") == normalize_question("what is roi") == "what is roi"
+
+
+def test_answers_persist_across_instances(tmp_path):
+    path = tmp_path / "answers.json"
+    AnswerCache(path=str(path)).put("what is roi", "Return on investment.")
+    assert AnswerCache(path=str(path)).get("what is roi") == "Return on investment."
+
+
+def test_corrupt_cache_file_starts_empty(tmp_path):
+    # Regression: a half-written file raised out of get_advisor and took the advisor down
+    path = tmp_path / "answers.json"
+    for content in ('{"what is roi": [1700000000.0, "Return', "[1, 2]", '{"q": 5}'):
+        path.write_text(content, encoding="utf-8")
+        cache = AnswerCache(path=str(path))
+        assert len(cache) == 0
+        cache.put("q", "a")
+        assert json.loads(path.read_text(encoding="utf-8"))["q"][1] == "a"
+    path.write_text("not json", encoding="utf-8")
+    assert len(get_advisor(None, str(path)).cache) == 0
+
+
+def test_concurrent_writers_never_collide(tmp_path):
+    # Regression: every writer went through the same "<path>.tmp", so one's replace could move another's file
+    path = str(tmp_path / "answers.json")
+    caches = [AnswerCache(path=path) for _ in range(4)]
+    errors = []
+
+    def write(cache, writer):
+        try:
+            for i in range(50):
+                cache.put(f"question {writer} {i}", "answer")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(cache, writer)) for writer, cache in enumerate(caches)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(AnswerCache(path=path)) == 50
+    assert [p.name for p in tmp_path.iterdir()] == ["answers.json"]
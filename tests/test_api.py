@@ -0,0 +1,107 @@
+import http.client
+import json
+import socket
+import threading
+
+import numpy as np
+import pytest
+
+from green_finance import api
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = api.make_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, method, path, payload=None):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+    body = None if payload is None else json.dumps(payload)
+    connection.request(method, path, body, {"Content-Type": "application/json"})
+    response = connection.getresponse()
+    result = response.status, json.loads(response.read())
+    connection.close()
+    return result
+
+
+def raw_request(server, head):
+    with socket.create_connection(("127.0.0.1", server.server_port), timeout=10) as sock:
+        sock.sendall(head.encode("ascii"))
+        return sock.recv(65536).split(b"\r\n", 1)[0]
+
+
+def test_health(server):
+    assert request(server, "GET", "/health") == (200, {"status": "ok", "reference_version": 1})
+
+
+def test_scalars_answer_scalars_and_lists_answer_lists(server):
+    status, body = request(server, "POST", "/roi", {"investment": 1000, "monthly_savings": 50, "years": 5})
+    assert status == 200 and body["roi"] == 200.0 and body["payback_months"] == 20.0
+    status, body = request(server, "POST", "/tariff/bill", {"kwh": [100, 300]})
+    assert status == 200 and body == {"bill": [21.8, 77.0]}
+
+
+def test_payback_without_savings_is_null(server):
+    status, body = request(server, "POST", "/roi", {"investment": 1000, "monthly_savings": 0, "years": 5})
+    assert status == 200 and body["payback_months"] is None
+
+
+@pytest.mark.parametrize("encoder", ["orjson", "json"])
+def test_broadcast_scalar_against_list(server, monkeypatch, encoder):
+    # A scalar broadcast against a list is a strided view, which orjson refuses
+    if encoder == "json":
+        monkeypatch.setattr(api, "orjson", None)
+    status, body = request(server, "POST", "/water/savings", {"monthly_bill": 100, "efficiency": [10, 20, 30]})
+    assert status == 200
+    assert body == {"monthly_bill": [100.0, 100.0, 100.0], "monthly_savings": [10.0, 20.0, 30.0]}
+
+
+@pytest.mark.parametrize("payload", [{"bill": None}, {"bill": [100, None]}, {"bill": "nan"}, {}])
+def test_missing_or_non_finite_numbers_are_rejected(server, payload):
+    status, body = request(server, "POST", "/tariff/kwh", payload)
+    assert status == 400 and "bill" in body["error"]
+
+
+def test_null_is_a_blank_cell_in_scenarios(server):
+    scenario = {"state": "Johor", "category": "Water", "house_type": None, "monthly_bill": 100,
+                "investment": 1000, "years": 5}
+    status, body = request(server, "POST", "/scenario", scenario)
+    assert status == 200 and body["roi"] == 20.0 and body["system_size_kw"] is None
+
+
+def test_scenarios_rows_and_columns_agree(server):
+    rows = [
+        {"state": "Johor", "category": "Solar", "house_type": "Terrace House", "monthly_bill": 300,
+         "investment": 20000, "years": 5},
+        {"state": "Sabah", "category": "Water", "monthly_bill": 120, "investment": 2000, "years": 3},
+    ]
+    columns = {name: [row.get(name) for row in rows] for name in rows[0]}
+    _, by_rows = request(server, "POST", "/scenarios", {"scenarios": rows})
+    _, by_columns = request(server, "POST", "/scenarios", {"columns": columns})
+    for name, values in by_columns["columns"].items():
+        assert [result[name] for result in by_rows["results"]] == values
+
+
+@pytest.mark.parametrize("length", ["abc", "-5"])
+def test_malformed_content_length_gets_400(server, length):
+    head = f"POST /tariff/kwh HTTP/1.1\r\nHost: test\r\nContent-Length: {length}\r\n\r\n"
+    assert raw_request(server, head) == b"HTTP/1.1 400 Bad Request"
+
+
+def test_unknown_endpoint_and_bad_json(server):
+    assert request(server, "POST", "/nope", {})[0] == 404
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+    connection.request("POST", "/roi", "[1, 2]")
+    assert connection.getresponse().status == 400
+
+
+def test_dumps_writes_non_finite_as_null(monkeypatch):
+    payload = {"values": np.array([1.0, np.nan, np.inf]), "scalar": np.float64(np.nan)}
+    expected = {"values": [1.0, None, None], "scalar": None}
+    assert json.loads(api.dumps(payload)) == expected
+    monkeypatch.setattr(api, "orjson", None)
+    assert json.loads(api.dumps(payload)) == expected
@@ -0,0 +1,29 @@
+import numpy as np
+
+from green_finance import cashflow
+
+
+def test_flat_savings_match_the_closed_form_npv():
+    investment = np.array([5000.0, 20000.0, 1000.0])
+    savings = np.array([150.0, 300.0, 10.0])
+    years = np.array([5.0, 10.0, 3.0])
+    result = cashflow.evaluate(investment, savings, years, discount_rate=0.05, chunk_size=2)
+    assert np.allclose(result["npv"], cashflow.npv(investment, savings, years, 0.05))
+    assert np.allclose(result["total_savings"], savings * years * 12)
+
+
+def test_irr_zeroes_the_npv():
+    savings = np.array([200.0, 10.0])
+    result = cashflow.evaluate(10000.0, savings, 10.0)
+    assert np.allclose(cashflow.npv(10000.0, savings, 10.0, result["irr"]), 0, atol=1e-6)
+
+
+def test_invalid_rows_are_nan():
+    # Regression: years=0 crashed the batch and a NaN horizon was read as the longest one
+    years = np.array([0.0, np.nan, 5.0, 0.5, 5.0])
+    investment = np.array([1000.0, 1000.0, 1000.0, 1000.0, np.inf])
+    result = cashflow.evaluate(investment, 100.0, years)
+    for values in result.values():
+        assert np.isnan(values[[0, 1, 3, 4]]).all()
+        assert np.isfinite(values[2])
+    assert np.isnan(cashflow.evaluate(1000.0, 100.0, 0)["npv"]).all()
@@ -0,0 +1,9 @@
+from green_finance import charts
+
+
+def test_charts_follow_a_reference_reload(reference_file):
+    # Regression: chart caches were keyed on the inputs only and kept drawing the old tariffs
+    before = charts.state_comparison_png(20000, 5, 725, 20, "Terrace House")
+    assert charts.state_comparison_png(20000, 5, 725, 20, "Terrace House") is before
+    reference_file(lambda raw: raw["water_tariffs"].update({state: 9.0 for state in raw["water_tariffs"]}))
+    assert charts.state_comparison_png(20000, 5, 725, 20, "Terrace House") != before
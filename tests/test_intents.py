@@ -0,0 +1,65 @@
+import pytest
+
+from green_finance.intents import IntentMatcher, match_intent
+
+
+def legacy_intent(question):
+    """The advisor's original rule layer (substring checks)."""
+    ql = question.lower().strip()
+    if "loan" in ql or "finance" in ql:
+        return "financing"
+    elif "roi" in ql or "payback" in ql:
+        return "roi"
+    elif "esg" in ql:
+        return "esg"
+    return None
+
+
+def intent_name(question):
+    intent = match_intent(question)
+    return None if intent is None else intent["name"]
+
+
+@pytest.mark.parametrize("question", [
+    "How do I get a solar loan?",
+    "Are there loans for SMEs?",
+    "Can I refinance my rooftop system?",
+    "What green finance schemes exist?",
+    "Is the project financed by the bank?",
+    "My finances are tight, any grants?",
+    "microfinance for small farms",
+    "What is the ROI of solar in Johor?",
+    "How long is the payback period?",
+    "Compare paybacks for solar and water",
+    "Does ESG reporting help?",
+    "ROI on a loan-financed system",
+    "What is a good ESG score and payback?",
+    "How much does a heat pump cost?",
+    "",
+])
+def test_matches_legacy_rules(question):
+    assert intent_name(question) == legacy_intent(question)
+
+
+@pytest.mark.parametrize("question", [
+    "Is there an android app?",
+    "A heroic effort to cut energy use",
+])
+def test_ignores_substrings_inside_other_words(question):
+    assert legacy_intent(question) == "roi"
+    assert intent_name(question) is None
+
+
+def test_financial_and_inflections():
+    for word in ("financial", "financing", "finances", "refinance", "refinancing", "loaned"):
+        assert intent_name(f"any {word} options?") == "financing"
+
+
+def test_priority_and_phrases():
+    matcher = IntentMatcher([
+        {"name": "low", "keywords": ["solar*"], "answer": "", "priority": 5},
+        {"name": "high", "keywords": ["net metering"], "answer": "", "priority": 0},
+    ])
+    assert matcher.match("solar panels and net metering")["name"] == "high"
+    assert matcher.match("solarpanel")["name"] == "low"
+    assert matcher.match("net zero") is None
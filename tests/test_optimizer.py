@@ -0,0 +1,52 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from green_finance import optimizer
+
+
+def _candidates(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "state": rng.choice(["Johor", "Selangor", "Sabah", "Kedah"], n),
+        "category": rng.choice(["Solar", "Water"], n),
+        "house_type": np.full(n, "Terrace House"),
+        "monthly_bill": np.round(rng.uniform(50, 1000, n), 2),
+        "investment": np.round(rng.uniform(1000, 30000, n), -2),
+        "years": rng.integers(1, 11, n).astype(float),
+    }
+
+
+def _brute_force(values, costs, budget):
+    best = 0.0
+    for size in range(1, len(values) + 1):
+        for subset in combinations(range(len(values)), size):
+            if costs[list(subset)].sum() <= budget:
+                best = max(best, values[list(subset)].sum())
+    return best
+
+
+@pytest.mark.parametrize("objective", [optimizer.SAVINGS, optimizer.NPV])
+def test_matches_brute_force(objective):
+    candidates = _candidates(12)
+    result = optimizer.optimize(candidates, 60000, objective=objective, workers=1)
+    values = result["scores"]["total_savings" if objective == optimizer.SAVINGS else "npv"]
+    costs = candidates["investment"]
+    assert result["stats"]["optimal"]
+    assert result["total_investment"] <= 60000
+    assert result["objective_value"] == pytest.approx(values[result["selected"]].sum())
+    assert result["objective_value"] == pytest.approx(_brute_force(np.maximum(values, 0), costs, 60000))
+
+
+def test_parallel_split_matches_serial(monkeypatch):
+    candidates = _candidates(16, seed=1)
+    serial = optimizer.optimize(candidates, 80000, workers=1)
+    # Force the escalation to the process pool on a small instance
+    monkeypatch.setattr(optimizer, "PARALLEL_THRESHOLD", 1)
+    monkeypatch.setattr(optimizer, "SERIAL_NODES", 1)
+    parallel = optimizer.optimize(candidates, 80000, workers=2, split_depth=3)
+    assert parallel["stats"]["workers"] == 2
+    assert parallel["stats"]["optimal"]
+    assert parallel["objective_value"] == pytest.approx(serial["objective_value"])
+    assert parallel["total_investment"] <= 80000
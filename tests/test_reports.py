@@ -0,0 +1,19 @@
+import io
+import zipfile
+
+from green_finance import reports
+
+
+def test_reports_zip_has_one_pdf_per_scenario():
+    scenarios = [
+        {"state": "Johor", "category": "Solar", "investment": 20000, "monthly_savings": 260, "years": 5},
+        {"state": "Sabah", "category": "Water", "investment": 3000, "monthly_savings": 40, "years": 3},
+        {"state": "Johor", "category": "Solar", "investment": 8000, "monthly_savings": 120, "years": 2},
+    ]
+    archive = zipfile.ZipFile(io.BytesIO(reports.submit_reports_zip(scenarios).result(timeout=120)))
+    names = archive.namelist()
+    # Two Johor solar projects share a report name; the second is numbered
+    assert names == ["roi_report_Johor_Solar.pdf", "roi_report_Sabah_Water.pdf", "roi_report_Johor_Solar_3.pdf"]
+    assert archive.testzip() is None
+    for name in names:
+        assert archive.read(name).startswith(b"%PDF")
@@ -0,0 +1,48 @@
+import numpy as np
+
+from green_finance import prediction, reference
+from green_finance.roi import evaluate_portfolio
+
+
+def _solar(house_types):
+    n = len(house_types)
+    return {
+        "state": np.full(n, "Johor"),
+        "category": np.full(n, "Solar"),
+        "house_type": np.array(house_types, dtype=object),
+        "monthly_bill": np.full(n, 300.0),
+        "investment": np.full(n, 20000.0),
+        "years": np.full(n, 5.0),
+    }
+
+
+def test_blank_house_type_scores_as_the_default():
+    # Regression: a blank house type scored NaN while the predicted ROI was filled in
+    default = next(iter(reference.current().house_types))
+    scored = evaluate_portfolio(_solar(["", default]))
+    assert np.isfinite(scored["roi"]).all()
+    assert scored["roi"][0] == scored["roi"][1]
+    predicted = prediction.predict_roi(_solar(["", default]))
+    assert np.isfinite(predicted).all() and predicted[0] == predicted[1]
+
+
+def test_unknown_house_type_is_nan_in_both():
+    scenarios = _solar(["Castle"])
+    assert np.isnan(evaluate_portfolio(scenarios)["roi"]).all()
+    assert np.isnan(prediction.predict_roi(scenarios)).all()
+
+
+def test_csv_blank_house_type_scores_as_the_default():
+    # Regression: pandas reads an empty cell as NaN, which used to become the house type "nan"
+    import pandas as pd
+
+    default = next(iter(reference.current().house_types))
+    frame = pd.DataFrame(_solar([np.nan, None, default]))
+    assert frame["house_type"].isna().sum() == 2
+    scored = evaluate_portfolio(frame)
+    assert np.isfinite(scored["system_size_kw"]).all() and np.isfinite(scored["roi"]).all()
+    assert scored["roi"][0] == scored["roi"][1] == scored["roi"][2]
+    predicted = prediction.predict_roi(frame)
+    assert np.isfinite(predicted).all() and predicted[0] == predicted[2]
+    all_blank = pd.DataFrame(_solar([np.nan, np.nan])).astype({"house_type": float})
+    assert np.isfinite(evaluate_portfolio(all_blank)["roi"]).all()
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from green_finance import scenario_cache
+from green_finance.scenario_cache import ScenarioCache, normalize
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalize_folds_equivalent_inputs():
+    assert normalize(300) == normalize(300.0) == normalize(np.int64(300)) == normalize(np.array(300.0))
+    assert normalize(-0.0) == normalize(0)
+    assert normalize(" Johor ") == "Johor"
+    assert normalize([1, "a"]) == (1.0, "a")
+    with pytest.raises(TypeError):
+        normalize(np.arange(3))
+
+
+def test_lru_eviction_and_ttl():
+    clock = FakeClock()
+    cache = ScenarioCache("test", max_entries=2, ttl=10, clock=clock)
+    calls = []
+
+    def value(key):
+        return cache.get_or_compute(key, lambda: calls.append(key) or key)
+
+    value("a"), value("b"), value("a"), value("c")  # "b" is least recently used
+    assert calls == ["a", "b", "c"]
+    value("a")
+    value("b")
+    assert calls == ["a", "b", "c", "b"]
+    clock.now = 11
+    value("b")
+    assert calls[-1] == "b" and cache.stats()["expirations"] == 1
+    assert cache.stats()["evictions"] == 2
+
+
+def test_zero_entries_disables_the_cache():
+    cache = ScenarioCache("test", max_entries=0)
+    calls = []
+    for _ in range(3):
+        cache.get_or_compute("a", lambda: calls.append(1))
+    assert len(calls) == 3 and cache.stats()["entries"] == 0
+
+
+def test_cached_arrays_are_shared_read_only():
+    first = scenario_cache.roi_summary(20000, 300, 5)
+    second = scenario_cache.roi_summary(20000.0, np.float64(300), 5)
+    assert first is second
+    with pytest.raises(ValueError):
+        first["savings"][0] = 0
+
+
+def test_results_follow_a_reference_reload(reference_file):
+    # Regression: keys used to ignore the reference data, serving old tariffs until the TTL ran out
+    before = scenario_cache.state_comparison(20000, 5, 725, 20, "Terrace House")
+    solar_before = scenario_cache.solar_hourly("Johor", 5.5, 725)
+    assert scenario_cache.state_comparison(20000, 5, 725, 20, "Terrace House") is before
+
+    def edit(raw):
+        raw["water_tariffs"] = {state: tariff * 3 for state, tariff in raw["water_tariffs"].items()}
+        raw["default_water_tariff"] *= 3
+        raw["solar_data"]["Johor"] *= 0.5
+
+    reference_file(edit)
+    after = scenario_cache.state_comparison(20000, 5, 725, 20, "Terrace House")
+    assert after is not before
+    assert np.allclose(
+        np.sort(after["monthly_bill"][after["category"] == "Water"]),
+        np.sort(before["monthly_bill"][before["category"] == "Water"]) * 3,
+    )
+    assert np.sum(scenario_cache.solar_hourly("Johor", 5.5, 725)["generation_kwh"]) < np.sum(solar_before["generation_kwh"])
+
@@ -0,0 +1,21 @@
+import csv
+import io
+
+import numpy as np
+
+from green_finance import sensitivity
+
+
+def test_roi_csv_streams_every_grid_cell():
+    investment, savings = sensitivity.grid_axes((1000, 50000), (10, 2000), 7)
+    years = np.arange(1, 4)
+    grid = sensitivity.roi_grid(investment, savings, years)
+    # A slice size that does not divide the grid, so the header must only come once
+    rows = list(csv.reader(io.StringIO(sensitivity.roi_csv(investment, savings, years, slice_size=3).decode("utf-8"))))
+    assert rows[0] == ["Investment (RM)", "Monthly Savings (RM)", "Years", "ROI (%)", "Payback (months)"]
+    table = np.array(rows[1:], dtype=float)
+    assert len(table) == grid["roi"].size
+    assert np.allclose(table[:, 3], np.round(grid["roi"].ravel(), 2), atol=0.01)
+    payback = np.broadcast_to(grid["payback_months"][:, :, None], grid["roi"].shape).ravel()
+    assert np.allclose(table[:, 4], np.round(payback, 2), atol=0.01)
+    assert table[:, 0].tolist() == np.repeat(np.round(investment, 2), len(savings) * len(years)).tolist()
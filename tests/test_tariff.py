@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from green_finance.tariff import TariffEngine, round_sen
+
+tariffs_tiers = [
+    (1, 200, 0.218),
+    (201, 300, 0.334),
+    (301, 600, 0.516),
+    (601, 900, 0.546),
+    (901, float('inf'), 0.571)
+]
+
+
+# The per-kWh tier loop and linear scan the engine replaced, kept as the oracle
+def calculate_bill_from_kwh(kwh):
+    bill = 0.0
+    remaining = kwh
+    for low, high, rate in tariffs_tiers:
+        limit = high - low + 1 if high != float('inf') else float('inf')
+        use = min(remaining, limit)
+        if use <= 0:
+            continue
+        bill += use * rate
+        remaining -= use
+        if remaining <= 0:
+            break
+    return round(bill, 2)
+
+
+def calculate_kwh_from_bill(target_bill, max_kwh=5000):
+    for kwh in range(1, max_kwh + 1):
+        if calculate_bill_from_kwh(kwh) >= target_bill:
+            return kwh
+    return max_kwh
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return TariffEngine(tariffs_tiers)
+
+
+def test_bill_from_kwh_matches_tier_loop(engine):
+    kwh = np.arange(0, 3001)
+    expected = [calculate_bill_from_kwh(int(k)) for k in kwh]
+    assert engine.bill_from_kwh(kwh).tolist() == expected
+    assert [engine.bill_from_kwh(int(k)) for k in kwh[::97]] == expected[::97]
+
+
+def test_kwh_from_bill_matches_linear_scan(engine):
+    rng = np.random.default_rng(0)
+    bills = np.round(rng.uniform(0, 2500, 300), 2)
+    # Tier edges and exact bills are where an off-by-one would show
+    edges = [calculate_bill_from_kwh(k) for k in (1, 200, 201, 300, 301, 600, 601, 900, 901)]
+    bills = np.concatenate([bills, edges, np.array(edges) + 0.01, [0.0, 1e6]])
+    expected = [calculate_kwh_from_bill(float(b)) for b in bills]
+    assert engine.kwh_from_bill(bills, max_kwh=5000).tolist() == expected
+    assert [engine.kwh_from_bill(float(b), max_kwh=5000) for b in bills[:50]] == expected[:50]
+
+
+def test_round_sen_matches_builtin_round():
+    values = np.array([415.58500000000004, 0.125, 2.675, 1.005, 123.4549999, 0.0])
+    assert round_sen(values).tolist() == [round(v, 2) for v in values.tolist()]
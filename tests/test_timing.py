@@ -0,0 +1,26 @@
+import json
+
+from green_finance import timing
+
+
+def test_repeated_sections_are_summed(tmp_path):
+    # Regression: the record kept only the last lap of a section marked twice
+    log_path = tmp_path / "timing.jsonl"
+    timer = timing.RerunTimer("test", log_path=str(log_path))
+    timer.sections = [("inputs", 0.002), ("sensitivity", 0.010), ("export", 0.001), ("sensitivity", 0.005)]
+    record = timer.finish()
+    assert list(record["sections_ms"]) == ["inputs", "sensitivity", "export"]
+    assert record["sections_ms"]["sensitivity"] == 15.0
+    logged = json.loads(log_path.read_text(encoding="utf-8"))
+    assert logged["sections_ms"] == record["sections_ms"]
+
+
+def test_laps_and_spans_are_recorded_in_order(tmp_path):
+    timer = timing.RerunTimer("test", log_path=None)
+    with timer.span("nested"):
+        pass
+    timer.lap("outer")
+    timer.lap("outer")
+    record = timer.record()
+    assert list(record["sections_ms"]) == ["nested", "outer"]
+    assert record["total_ms"] >= record["sections_ms"]["outer"]